@@ -211,9 +211,9 @@ class FloorPlanCorridorGenerator:
                 continue
                 
             other_center = other_room['centroid']
-            distance = math.sqrt(
-                (room_center['x'] - other_center['x'])**2 + 
-                (room_center['y'] - other_center['y'])**2
+            distance = math.hypot(
+                room_center['x'] - other_center['x'],
+                room_center['y'] - other_center['y']
             )
             
             if distance <= max_distance:
@@ -627,7 +627,7 @@ class FloorPlanCorridorGenerator:
             # Calculate direction vector
             dx = target_center['x'] - entrance_center['x']
             dy = target_center['y'] - entrance_center['y']
-            distance = math.sqrt(dx**2 + dy**2)
+            distance = math.hypot(dx, dy)
             
             if distance > 0:
                 # Normalize direction
@@ -837,8 +837,8 @@ class FloorPlanCorridorGenerator:
                     'y': corridor['y'] + corridor['height'] / 2
                 }
                 
-                distance = math.sqrt(
-                    (point['x'] - center['x'])**2 + (point['y'] - center['y'])**2
+                distance = math.hypot(
+                    point['x'] - center['x'], point['y'] - center['y']
                 )
                 
                 if distance < min_distance:
@@ -4,7 +4,128 @@
 
 import json
 import math
-from typing import Dict, List, Any, Tuple, Optional
+from dataclasses import dataclass, field, replace
+from itertools import chain
+from typing import Dict, List, Any, NamedTuple, Tuple, Optional
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; nearest queries fall back to argmin
+    cKDTree = None
+
+
+class Centroid(NamedTuple):
+    """Room centroid as a fixed tuple - far cheaper than a per-room dict"""
+    x: float
+    y: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'x': self.x, 'y': self.y}
+
+
+class Bounds(NamedTuple):
+    """Axis-aligned bounding rectangle as a fixed tuple"""
+    minX: float
+    minY: float
+    maxX: float
+    maxY: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'minX': self.minX, 'minY': self.minY,
+                'maxX': self.maxX, 'maxY': self.maxY}
+
+
+@dataclass(slots=True)
+class Ilot:
+    """Workspace ilot; slotted to avoid a ~10-key dict per instance"""
+    id: str
+    category: str
+    area: float
+    width: float
+    height: float
+    capacity: int
+    type: str
+    x: float = 0.0
+    y: float = 0.0
+    room_id: Optional[str] = None
+    placed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {'id': self.id, 'category': self.category, 'area': self.area,
+             'width': self.width, 'height': self.height,
+             'capacity': self.capacity, 'type': self.type}
+        if self.placed:
+            d.update(x=self.x, y=self.y, room_id=self.room_id, placed=True)
+        return d
+
+
+@dataclass(slots=True)
+class Corridor:
+    """Corridor segment; attribute access instead of per-entry dict hashing"""
+    id: str
+    type: str
+    x: float
+    y: float
+    width: float
+    height: float
+    area: float
+    direction: str
+    connects: Any = None
+    cx: float = field(init=False)
+    cy: float = field(init=False)
+
+    def __post_init__(self):
+        # Center cached once at construction; midpoint/nearest code reads it
+        # directly instead of recomputing x + width/2 per query
+        self.cx = self.x + self.width / 2
+        self.cy = self.y + self.height / 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {'id': self.id, 'type': self.type, 'x': self.x, 'y': self.y,
+             'width': self.width, 'height': self.height, 'area': self.area,
+             'direction': self.direction}
+        if self.connects is not None:
+            d['connects'] = self.connects
+        return d
+
+
+@dataclass(slots=True)
+class FlowLine:
+    """Red circulation flow line (optionally with an arrow head)"""
+    type: str
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    color: str = 'red'
+    width: int = 2
+    arrow_head: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {'type': self.type, 'x1': self.x1, 'y1': self.y1,
+             'x2': self.x2, 'y2': self.y2, 'color': self.color,
+             'width': self.width}
+        if self.arrow_head:
+            d['arrow_head'] = True
+        return d
+
+
+@dataclass(slots=True)
+class Arrow:
+    """Directional circulation arrow"""
+    type: str
+    x: float
+    y: float
+    direction: str
+    size: float
+    color: str = 'red'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.type, 'x': self.x, 'y': self.y,
+                'direction': self.direction, 'size': self.size,
+                'color': self.color}
 
 class ThreeStageFloorPlanProcessor:
     """
@@ -33,6 +154,25 @@ class ThreeStageFloorPlanProcessor:
             '5-10': 0.25,   # 25% large collaboration zones
             '10-15': 0.05   # 5% conference areas
         }
+        # Reusable scratch buffer for corridor centers; grown on demand so
+        # repeated nearest-corridor queries don't re-allocate per call.
+        self._corridor_centers = np.empty((0, 2), dtype=np.float64)
+        # KD-tree over the current center batch (None without scipy)
+        self._corridor_tree = None
+
+    def _fill_corridor_centers(self, corridors: List['Corridor']) -> np.ndarray:
+        """Fill the scratch buffer with corridor centers; returns an (N, 2) view"""
+        n = len(corridors)
+        if self._corridor_centers.shape[0] < n:
+            self._corridor_centers = np.empty((n, 2), dtype=np.float64)
+        buf = self._corridor_centers
+        for i, c in enumerate(corridors):
+            buf[i, 0] = c.cx
+            buf[i, 1] = c.cy
+
+        # Index the batch once: O(log N) queries instead of linear scans
+        self._corridor_tree = cKDTree(buf[:n]) if cKDTree is not None and n else None
+        return buf[:n]
         
     def process_stage1_empty_plan(self, floor_plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -84,7 +224,13 @@ class ThreeStageFloorPlanProcessor:
                 'color_scheme': 'architectural_clean'
             }
         }
-        
+
+        # Slotted geometry crosses the result boundary as plain dicts,
+        # the same convention Ilot/Corridor/FlowLine follow via to_dict()
+        for analyzed in analyzed_rooms:
+            analyzed['centroid'] = analyzed['centroid'].to_dict()
+            analyzed['bounds'] = analyzed['bounds'].to_dict()
+
         print(f"✅ Stage 1 Complete: {len(analyzed_rooms)} rooms analyzed, {available_space:.1f}m² available")
         return stage1_result
         
@@ -114,14 +260,16 @@ class ThreeStageFloorPlanProcessor:
         # Place ilots in suitable rooms
         placed_ilots = self._place_ilots_optimally(generated_ilots, stage1_result['rooms'])
         
-        # Calculate placement statistics
-        total_placed_area = sum(ilot['area'] for ilot in placed_ilots)
+        # Calculate placement statistics (single C-level reduction)
+        total_placed_area = float(np.fromiter(
+            (ilot.area for ilot in placed_ilots), dtype=np.float64, count=len(placed_ilots)
+        ).sum())
         coverage_achieved = total_placed_area / room_area if room_area > 0 else 0
-        
+
         stage2_result = {
             'stage': 2,
             'type': 'ilot_placement',
-            'ilots': placed_ilots,
+            'ilots': [ilot.to_dict() for ilot in placed_ilots],
             'base_layout': stage1_result,  # Preserve Stage 1 data
             'placement_stats': {
                 'total_ilots': len(placed_ilots),
@@ -183,15 +331,17 @@ class ThreeStageFloorPlanProcessor:
         
         # Generate circulation flow indicators (red arrows/lines)
         flow_indicators = self._generate_circulation_flow(corridors, entrances, ilots)
-        
-        # Calculate corridor network statistics
-        total_corridor_area = sum(c['area'] for c in corridors)
-        
+
+        # Calculate corridor network statistics (single C-level reduction)
+        total_corridor_area = float(np.fromiter(
+            (c.area for c in corridors), dtype=np.float64, count=len(corridors)
+        ).sum())
+
         stage3_result = {
             'stage': 3,
             'type': 'complete_layout',
-            'corridors': corridors,
-            'flow_indicators': flow_indicators,
+            'corridors': [c.to_dict() for c in corridors],
+            'flow_indicators': [f.to_dict() for f in flow_indicators],
             'ilot_layout': stage2_result,  # Preserve Stage 2 data
             'corridor_stats': {
                 'total_corridors': len(corridors),
@@ -214,27 +364,40 @@ class ThreeStageFloorPlanProcessor:
         print(f"✅ Stage 3 Complete: {len(corridors)} corridors, {len(flow_indicators)} flow indicators")
         return stage3_result
     
-    def process_complete_workflow(self, floor_plan_data: Dict[str, Any], 
-                                options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_complete_workflow(self, floor_plan_data: Dict[str, Any],
+                                options: Dict[str, Any] = None,
+                                compact: bool = False) -> Dict[str, Any]:
         """
         Complete 3-stage processing workflow
         Returns all stages for progressive visualization
+
+        With compact=True the embedded base_layout/ilot_layout copies are
+        replaced by *_ref keys into 'stages' (resolve via _resolve_layout),
+        so each stage result is serialized only once for large plans.
         """
         print("🚀 Starting 3-Stage Floor Plan Processing")
         print("=" * 50)
-        
+
         if options is None:
             options = {}
-        
+
         # Stage 1: Empty Plan Analysis
         stage1 = self.process_stage1_empty_plan(floor_plan_data)
-        
+
         # Stage 2: Ilot Placement
         stage2 = self.process_stage2_ilot_placement(stage1, options)
-        
-        # Stage 3: Corridor Generation  
+
+        # Stage 3: Corridor Generation
         stage3 = self.process_stage3_corridor_generation(stage2, options)
-        
+
+        if compact:
+            # Swap nested stage embeddings for reference keys; shallow copies
+            # so the in-flight stage results stay usable.
+            stage2 = {k: v for k, v in stage2.items() if k != 'base_layout'}
+            stage2['base_layout_ref'] = 'stage1_empty'
+            stage3 = {k: v for k, v in stage3.items() if k != 'ilot_layout'}
+            stage3['ilot_layout_ref'] = 'stage2_ilots'
+
         # Compile complete result
         complete_result = {
             'workflow_type': 'three_stage_processing',
@@ -262,29 +425,43 @@ class ThreeStageFloorPlanProcessor:
         
         print("\n🎉 Complete 3-Stage Workflow Finished!")
         return complete_result
-    
+
+    @staticmethod
+    def _resolve_layout(complete_result: Dict[str, Any], ref: str) -> Dict[str, Any]:
+        """Resolve a *_ref key from a compact workflow result to its stage"""
+        return complete_result['stages'][ref]
+
     # Helper Methods for Stage Processing
     
     def _analyze_individual_room(self, room: Dict, index: int) -> Dict[str, Any]:
         """Analyze individual room properties"""
         room_id = room.get('id', f'room_{index:02d}')
         
+        # Coerce the polygon to a float array once; every geometric helper
+        # below reads the local copy so the caller's dict stays untouched
+        # (it is embedded in the result under 'original').
+        polygon = self._coerce_polygon(room['polygon']) if 'polygon' in room else None
+
         # Get or calculate area
         area = room.get('area', 0)
-        if not area and 'polygon' in room:
-            area = self._calculate_polygon_area(room['polygon'])
-        
+        if not area and polygon is not None:
+            area = self._calculate_polygon_area(polygon)
+
         # Get or calculate centroid
         centroid = room.get('center') or room.get('centroid')
-        if not centroid and 'polygon' in room:
-            centroid = self._calculate_centroid(room['polygon'])
-        
+        if isinstance(centroid, dict):
+            centroid = Centroid(centroid.get('x', 0), centroid.get('y', 0))
+        elif isinstance(centroid, (list, tuple)):
+            centroid = Centroid(*centroid[:2])
+        if not centroid and polygon is not None:
+            centroid = self._calculate_centroid(polygon)
+
         return {
             'id': room_id,
             'area': area,
-            'centroid': centroid or {'x': 0, 'y': 0},
+            'centroid': centroid or Centroid(0, 0),
             'type': room.get('type', 'office'),
-            'bounds': self._get_room_bounds(room),
+            'bounds': self._get_room_bounds(room, polygon),
             'measurements': {
                 'area_text': f"{area:.1f}m²",
                 'show_dimensions': True
@@ -293,8 +470,8 @@ class ThreeStageFloorPlanProcessor:
             'original': room
         }
     
-    def _generate_ilots_by_distribution(self, distribution: Dict[str, float], 
-                                      target_area: float) -> List[Dict]:
+    def _generate_ilots_by_distribution(self, distribution: Dict[str, float],
+                                      target_area: float) -> List[Ilot]:
         """Generate ilots according to size distribution"""
         ilots = []
         
@@ -331,137 +508,168 @@ class ThreeStageFloorPlanProcessor:
                 min_cap, max_cap = category_info['capacity_range']
                 capacity = int(min_cap + area_factor * (max_cap - min_cap))
                 
-                ilots.append({
-                    'id': f'ilot_{ilot_counter:03d}',
-                    'category': category,
-                    'area': area,
-                    'width': width,
-                    'height': height,
-                    'capacity': capacity,
-                    'type': self._determine_workspace_type(capacity)
-                })
+                ilots.append(Ilot(
+                    id=f'ilot_{ilot_counter:03d}',
+                    category=category,
+                    area=area,
+                    width=width,
+                    height=height,
+                    capacity=capacity,
+                    type=self._determine_workspace_type(capacity)
+                ))
                 ilot_counter += 1
         
         return ilots
     
-    def _place_ilots_optimally(self, ilots: List[Dict], rooms: List[Dict]) -> List[Dict]:
+    def _place_ilots_optimally(self, ilots: List[Ilot], rooms: List[Dict]) -> List[Ilot]:
         """Place ilots in rooms using optimal positioning algorithm"""
         placed_ilots = []
         
         # Filter suitable rooms and sort by area
         suitable_rooms = [r for r in rooms if r['suitability']['suitable']]
         suitable_rooms.sort(key=lambda r: r['area'], reverse=True)
-        
-        # Track room occupancy
-        room_usage = {room['id']: {'used_area': 0, 'ilots': []} for room in suitable_rooms}
-        
+
+        # Track room occupancy via a flat accumulator indexed by room position;
+        # cheaper per ilot than a dict-of-dicts lookup and update.
+        used_area = np.zeros(len(suitable_rooms), dtype=np.float64)
+        room_ilots: List[List[Ilot]] = [[] for _ in suitable_rooms]
+
+        # Precompute each room's placement grid once, in a list parallel to
+        # suitable_rooms; per-ilot positioning then reduces to arithmetic on
+        # the cached tuple without mutating the stage 1 room dicts.
+        margin = 0.5  # 50cm margin from walls
+        room_grids = []
+        for room in suitable_rooms:
+            b = self._get_room_bounds(room)
+            room_grids.append((b.minX + margin, b.minY + margin, b.maxX, b.maxY))
+
         # Sort ilots by area (place larger ones first)
-        sorted_ilots = sorted(ilots, key=lambda i: i['area'], reverse=True)
-        
+        sorted_ilots = sorted(ilots, key=lambda i: i.area, reverse=True)
+
+        # Once a room can no longer hold even the smallest ilot it is dead
+        # for good (areas only shrink down the sorted list), so later scans
+        # skip it outright.
+        room_dead = np.zeros(len(suitable_rooms), dtype=bool)
+        min_required = sorted_ilots[-1].area * 1.3 if sorted_ilots else 0.0
+
         for ilot in sorted_ilots:
-            best_room = None
-            
-            for room in suitable_rooms:
-                available_area = room['area'] - room_usage[room['id']]['used_area']
-                required_area = ilot['area'] * 1.3  # Include circulation space
-                
-                if available_area >= required_area:
-                    best_room = room
+            required_area = ilot.area * 1.3  # Include circulation space
+            best_idx = -1
+
+            for idx, room in enumerate(suitable_rooms):
+                if room_dead[idx]:
+                    continue
+                available = room['area'] - used_area[idx]
+                if available < min_required:
+                    room_dead[idx] = True
+                    continue
+                if available >= required_area:
+                    best_idx = idx
                     break
-            
-            if best_room:
+
+            if best_idx >= 0:
+                best_room = suitable_rooms[best_idx]
+
                 # Calculate position within room
                 position = self._calculate_optimal_position(
-                    ilot, best_room, room_usage[best_room['id']]['ilots']
+                    ilot, room_grids[best_idx], len(room_ilots[best_idx])
                 )
-                
-                placed_ilot = {
-                    **ilot,
-                    'x': position['x'],
-                    'y': position['y'],
-                    'room_id': best_room['id'],
-                    'placed': True
-                }
-                
+
+                placed_ilot = replace(
+                    ilot,
+                    x=position['x'],
+                    y=position['y'],
+                    room_id=best_room['id'],
+                    placed=True
+                )
+
                 placed_ilots.append(placed_ilot)
-                room_usage[best_room['id']]['used_area'] += ilot['area'] * 1.3
-                room_usage[best_room['id']]['ilots'].append(placed_ilot)
-        
+                used_area[best_idx] += required_area
+                room_ilots[best_idx].append(placed_ilot)
+
         return placed_ilots
     
-    def _generate_main_spines(self, rooms: List[Dict], ilots: List[Dict], 
-                            bounds: Dict, corridor_width: float) -> List[Dict]:
+    def _generate_main_spines(self, rooms: List[Dict], ilots: List[Dict],
+                            bounds: Dict, corridor_width: float) -> List[Corridor]:
         """Generate main circulation spines"""
         corridors = []
-        
+
         # Horizontal main spine
         center_y = (bounds['minY'] + bounds['maxY']) / 2
-        main_horizontal = {
-            'id': 'main_horizontal_spine',
-            'type': 'main_spine',
-            'x': bounds['minX'] + 1,
-            'y': center_y - corridor_width / 2,
-            'width': bounds['maxX'] - bounds['minX'] - 2,
-            'height': corridor_width,
-            'area': (bounds['maxX'] - bounds['minX'] - 2) * corridor_width,
-            'direction': 'horizontal'
-        }
-        corridors.append(main_horizontal)
+        corridors.append(Corridor(
+            id='main_horizontal_spine',
+            type='main_spine',
+            x=bounds['minX'] + 1,
+            y=center_y - corridor_width / 2,
+            width=bounds['maxX'] - bounds['minX'] - 2,
+            height=corridor_width,
+            area=(bounds['maxX'] - bounds['minX'] - 2) * corridor_width,
+            direction='horizontal'
+        ))
         
         # Vertical distribution spines
         if ilots:
-            # Group ilots by approximate X position
-            x_positions = sorted(set(round(ilot.get('x', 0) / 10) * 10 
-                                   for ilot in ilots if 'x' in ilot))
-            
-            for i, x_pos in enumerate(x_positions[::2]):  # Every other position
-                vertical_spine = {
-                    'id': f'vertical_spine_{i}',
-                    'type': 'vertical_spine',
-                    'x': x_pos - corridor_width / 2,
-                    'y': bounds['minY'] + 1,
-                    'width': corridor_width,
-                    'height': bounds['maxY'] - bounds['minY'] - 2,
-                    'area': corridor_width * (bounds['maxY'] - bounds['minY'] - 2),
-                    'direction': 'vertical'
-                }
-                corridors.append(vertical_spine)
+            # Group ilots by approximate X position (rounded to 10m bins);
+            # np.unique returns the sorted distinct bins in one C pass.
+            xs = np.array([ilot['x'] for ilot in ilots if 'x' in ilot], dtype=np.float64)
+            x_positions = np.unique(np.round(xs * 0.1) * 10)
+
+            for i, x_pos in enumerate(x_positions[::2].tolist()):  # Every other position
+                corridors.append(Corridor(
+                    id=f'vertical_spine_{i}',
+                    type='vertical_spine',
+                    x=x_pos - corridor_width / 2,
+                    y=bounds['minY'] + 1,
+                    width=corridor_width,
+                    height=bounds['maxY'] - bounds['minY'] - 2,
+                    area=corridor_width * (bounds['maxY'] - bounds['minY'] - 2),
+                    direction='vertical'
+                ))
         
         return corridors
     
-    def _generate_inter_room_corridors(self, rooms: List[Dict], 
-                                     corridor_width: float) -> List[Dict]:
+    def _generate_inter_room_corridors(self, rooms: List[Dict],
+                                     corridor_width: float) -> List[Corridor]:
         """Generate corridors between adjacent rooms"""
         corridors = []
-        
-        # Find room pairs that should be connected
+
+        # Derived from the rooms argument on every call; a cross-stage
+        # cache could go stale when one processor serves several plans
+        centroids = np.array(
+            [(c['x'], c['y']) if isinstance(c, dict) else tuple(c)
+             for c in (r['centroid'] for r in rooms)],
+            dtype=np.float64
+        ).reshape(-1, 2)
+
+        # All pairwise centroid distances in one vectorized pass
+        diffs = centroids[:, None, :] - centroids[None, :, :]
+        distances = np.sqrt((diffs ** 2).sum(axis=2))
+
+        # Find room pairs that should be connected (5-20m apart)
         for i, room1 in enumerate(rooms):
-            for room2 in rooms[i+1:]:
-                distance = math.sqrt(
-                    (room1['centroid']['x'] - room2['centroid']['x'])**2 +
-                    (room1['centroid']['y'] - room2['centroid']['y'])**2
-                )
-                
-                # Connect rooms that are 5-20m apart
-                if 5 <= distance <= 20:
-                    corridor = self._create_room_connector(room1, room2, corridor_width)
+            for j in range(i + 1, len(rooms)):
+                if 5 <= distances[i, j] <= 20:
+                    corridor = self._create_room_connector(room1, rooms[j], corridor_width)
                     if corridor:
                         corridors.append(corridor)
-        
+
         return corridors[:3]  # Limit connections to avoid overcrowding
     
-    def _generate_ilot_access_corridors(self, ilots: List[Dict], 
-                                      existing_corridors: List[Dict], 
-                                      corridor_width: float) -> List[Dict]:
+    def _generate_ilot_access_corridors(self, ilots: List[Dict],
+                                      existing_corridors: List[Corridor],
+                                      corridor_width: float) -> List[Corridor]:
         """Generate access corridors to ilots"""
         corridors = []
-        
+
+        # Corridor centers computed once for the whole query batch
+        centers = self._fill_corridor_centers(existing_corridors)
+
         for ilot in ilots:
             if 'x' not in ilot:
                 continue
-                
+
             # Find nearest main corridor
-            nearest_corridor = self._find_nearest_corridor(ilot, existing_corridors)
+            nearest_corridor = self._find_nearest_corridor(ilot, existing_corridors, centers)
             if nearest_corridor:
                 access_path = self._create_ilot_access_path(ilot, nearest_corridor, corridor_width)
                 if access_path:
@@ -469,106 +677,108 @@ class ThreeStageFloorPlanProcessor:
         
         return corridors
     
-    def _generate_entrance_access_paths(self, entrances: List[Dict], 
-                                      corridors: List[Dict], 
-                                      corridor_width: float) -> List[Dict]:
+    def _generate_entrance_access_paths(self, entrances: List[Dict],
+                                      corridors: List[Corridor],
+                                      corridor_width: float) -> List[Corridor]:
         """Generate access paths from entrances to corridor network"""
         access_corridors = []
-        
+
+        centers = self._fill_corridor_centers(corridors)
+
         for i, entrance in enumerate(entrances):
             entrance_center = self._get_entrance_center(entrance)
             if not entrance_center:
                 continue
-                
-            nearest_corridor = self._find_nearest_corridor_to_point(entrance_center, corridors)
+
+            nearest_corridor = self._find_nearest_corridor_to_point(entrance_center, corridors, centers)
             if nearest_corridor:
-                access_path = {
-                    'id': f'entrance_access_{i}',
-                    'type': 'entrance_access',
-                    'x': min(entrance_center['x'], nearest_corridor['x']),
-                    'y': entrance_center['y'] - corridor_width / 2,
-                    'width': abs(entrance_center['x'] - (nearest_corridor['x'] + nearest_corridor['width']/2)),
-                    'height': corridor_width,
-                    'area': abs(entrance_center['x'] - (nearest_corridor['x'] + nearest_corridor['width']/2)) * corridor_width,
-                    'connects': f"entrance_{i}",
-                    'direction': 'horizontal'
-                }
-                access_corridors.append(access_path)
-        
+                span = abs(entrance_center['x'] - nearest_corridor.cx)
+                access_corridors.append(Corridor(
+                    id=f'entrance_access_{i}',
+                    type='entrance_access',
+                    x=min(entrance_center['x'], nearest_corridor.x),
+                    y=entrance_center['y'] - corridor_width / 2,
+                    width=span,
+                    height=corridor_width,
+                    area=span * corridor_width,
+                    connects=f"entrance_{i}",
+                    direction='horizontal'
+                ))
+
         return access_corridors
     
-    def _generate_circulation_flow(self, corridors: List[Dict], 
-                                 entrances: List[Dict], ilots: List[Dict]) -> List[Dict]:
+    def _generate_circulation_flow(self, corridors: List[Corridor],
+                                 entrances: List[Dict], ilots: List[Dict]) -> List[Any]:
         """Generate red circulation flow indicators (lines and arrows)"""
-        flow_indicators = []
-        
-        # Flow lines along corridors
-        for corridor in corridors:
-            flow_lines = self._create_corridor_flow_lines(corridor)
-            flow_indicators.extend(flow_lines)
-        
-        # Directional arrows at key points
-        for corridor in corridors:
-            if corridor['type'] == 'main_spine':
-                arrows = self._create_directional_arrows(corridor)
-                flow_indicators.extend(arrows)
-        
-        # Entrance flow indicators
-        for entrance in entrances:
-            entrance_flows = self._create_entrance_flow_indicators(entrance, corridors)
-            flow_indicators.extend(entrance_flows)
-        
+        # Partition once so the spine predicate isn't re-evaluated inside the
+        # arrow pass, then grow the result list monotonically via chained
+        # iterators instead of repeated small extends.
+        spine_corridors = [c for c in corridors if c.type == 'main_spine']
+        h_corridors = [c for c in corridors if c.direction == 'horizontal']
+        v_corridors = [c for c in corridors if c.direction != 'horizontal']
+
+        flow_indicators = self._flow_lines_horizontal(h_corridors)
+        flow_indicators.extend(self._flow_lines_vertical(v_corridors))
+        flow_indicators.extend(chain.from_iterable(
+            self._create_directional_arrows(c) for c in spine_corridors
+        ))
+        centers = self._fill_corridor_centers(corridors)
+        flow_indicators.extend(chain.from_iterable(
+            self._create_entrance_flow_indicators(e, corridors, centers) for e in entrances
+        ))
+
         return flow_indicators
     
     # Utility Methods
     
-    def _calculate_polygon_area(self, polygon: List) -> float:
+    @staticmethod
+    def _coerce_polygon(polygon: List) -> np.ndarray:
+        """Coerce a polygon ([x, y] pairs or {'x', 'y'} dicts) to an (N, 2) array"""
+        if polygon and isinstance(polygon[0], dict):
+            coords = np.fromiter(
+                chain.from_iterable((p.get('x', 0), p.get('y', 0)) for p in polygon),
+                dtype=np.float64, count=2 * len(polygon)
+            )
+            return coords.reshape(-1, 2)
+        return np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+
+    def _calculate_polygon_area(self, coords: np.ndarray) -> float:
         """Calculate area using shoelace formula"""
-        if len(polygon) < 3:
+        if len(coords) < 3:
             return 0
-        
-        area = 0
-        for i in range(len(polygon)):
-            j = (i + 1) % len(polygon)
-            p1, p2 = polygon[i], polygon[j]
-            x1 = p1[0] if isinstance(p1, list) else p1.get('x', 0)
-            y1 = p1[1] if isinstance(p1, list) else p1.get('y', 0) 
-            x2 = p2[0] if isinstance(p2, list) else p2.get('x', 0)
-            y2 = p2[1] if isinstance(p2, list) else p2.get('y', 0)
-            area += x1 * y2 - x2 * y1
-        
-        return abs(area) / 2
-    
-    def _calculate_centroid(self, polygon: List) -> Dict[str, float]:
+
+        x, y = coords[:, 0], coords[:, 1]
+        return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+    def _calculate_centroid(self, coords: np.ndarray) -> Centroid:
         """Calculate polygon centroid"""
-        if not polygon:
-            return {'x': 0, 'y': 0}
-        
-        x_sum = sum(p[0] if isinstance(p, list) else p.get('x', 0) for p in polygon)
-        y_sum = sum(p[1] if isinstance(p, list) else p.get('y', 0) for p in polygon)
-        
-        return {'x': x_sum / len(polygon), 'y': y_sum / len(polygon)}
-    
-    def _get_room_bounds(self, room: Dict) -> Dict[str, float]:
-        """Get room bounding rectangle"""
+        if len(coords) == 0:
+            return Centroid(0, 0)
+
+        mean = coords.mean(axis=0)
+        return Centroid(float(mean[0]), float(mean[1]))
+
+    def _get_room_bounds(self, room: Dict,
+                         polygon: Optional[np.ndarray] = None) -> Bounds:
+        """Get room bounding rectangle (reusing a pre-coerced polygon)"""
         if 'bounds' in room:
-            return room['bounds']
-        
+            bounds = room['bounds']
+            if isinstance(bounds, dict):
+                return Bounds(bounds['minX'], bounds['minY'], bounds['maxX'], bounds['maxY'])
+            return bounds
+
         if 'polygon' in room:
-            polygon = room['polygon']
-            x_coords = [p[0] if isinstance(p, list) else p.get('x', 0) for p in polygon]
-            y_coords = [p[1] if isinstance(p, list) else p.get('y', 0) for p in polygon]
-            
-            return {
-                'minX': min(x_coords), 'maxX': max(x_coords),
-                'minY': min(y_coords), 'maxY': max(y_coords)
-            }
-        
+            coords = polygon
+            if coords is None:
+                coords = self._coerce_polygon(room['polygon'])
+
+            mins = coords.min(axis=0)
+            maxs = coords.max(axis=0)
+            return Bounds(float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1]))
+
         # Default bounds
-        return {
-            'minX': room.get('x', 0), 'maxX': room.get('x', 0) + room.get('width', 10),
-            'minY': room.get('y', 0), 'maxY': room.get('y', 0) + room.get('height', 10)
-        }
+        x, y = room.get('x', 0), room.get('y', 0)
+        return Bounds(x, y, x + room.get('width', 10), y + room.get('height', 10))
     
     def _assess_ilot_suitability(self, area: float, room_type: str) -> Dict[str, Any]:
         """Assess room suitability for ilot placement"""
@@ -596,96 +806,96 @@ class ThreeStageFloorPlanProcessor:
         else:
             return 'collaboration_area'
     
-    def _calculate_optimal_position(self, ilot: Dict, room: Dict, 
-                                  existing_ilots: List[Dict]) -> Dict[str, float]:
-        """Calculate optimal position for ilot in room"""
-        bounds = room['bounds']
+    def _calculate_optimal_position(self, ilot: Ilot,
+                                  room_grid: Tuple[float, float, float, float],
+                                  k: int) -> Dict[str, float]:
+        """Calculate position for the k-th ilot placed on a room's grid"""
+        grid_x, grid_y, max_x, max_y = room_grid
         margin = 0.5  # 50cm margin from walls
-        
-        # Simple grid-based placement
-        grid_x = bounds['minX'] + margin
-        grid_y = bounds['minY'] + margin
-        
-        # Offset based on existing ilots to avoid overlap
-        offset_x = len(existing_ilots) * (ilot['width'] + 1.0)
-        offset_y = (len(existing_ilots) // 2) * (ilot['height'] + 1.0)
-        
+
+        # Offset based on placement ordinal to avoid overlap
+        offset_x = k * (ilot.width + 1.0)
+        offset_y = (k // 2) * (ilot.height + 1.0)
+
         return {
-            'x': min(grid_x + offset_x, bounds['maxX'] - ilot['width'] - margin),
-            'y': min(grid_y + offset_y, bounds['maxY'] - ilot['height'] - margin)
+            'x': min(grid_x + offset_x, max_x - ilot.width - margin),
+            'y': min(grid_y + offset_y, max_y - ilot.height - margin)
         }
     
-    def _create_room_connector(self, room1: Dict, room2: Dict, 
-                             corridor_width: float) -> Optional[Dict]:
+    def _create_room_connector(self, room1: Dict, room2: Dict,
+                             corridor_width: float) -> Optional[Corridor]:
         """Create corridor connecting two rooms"""
         c1, c2 = room1['centroid'], room2['centroid']
-        
-        return {
-            'id': f"connect_{room1['id']}_{room2['id']}",
-            'type': 'room_connector',
-            'x': min(c1['x'], c2['x']),
-            'y': min(c1['y'], c2['y']) - corridor_width / 2,
-            'width': abs(c1['x'] - c2['x']),
-            'height': corridor_width,
-            'area': abs(c1['x'] - c2['x']) * corridor_width,
-            'connects': [room1['id'], room2['id']],
-            'direction': 'horizontal'
-        }
-    
-    def _find_nearest_corridor(self, ilot: Dict, corridors: List[Dict]) -> Optional[Dict]:
+        if isinstance(c1, dict):
+            c1 = Centroid(c1['x'], c1['y'])
+        if isinstance(c2, dict):
+            c2 = Centroid(c2['x'], c2['y'])
+
+        return Corridor(
+            id=f"connect_{room1['id']}_{room2['id']}",
+            type='room_connector',
+            x=min(c1.x, c2.x),
+            y=min(c1.y, c2.y) - corridor_width / 2,
+            width=abs(c1.x - c2.x),
+            height=corridor_width,
+            area=abs(c1.x - c2.x) * corridor_width,
+            connects=[room1['id'], room2['id']],
+            direction='horizontal'
+        )
+    
+    def _find_nearest_corridor(self, ilot: Dict, corridors: List[Corridor],
+                             centers: Optional[np.ndarray] = None) -> Optional[Corridor]:
         """Find nearest corridor to an ilot"""
         if not corridors:
             return None
-            
-        ilot_center = {'x': ilot['x'] + ilot['width']/2, 'y': ilot['y'] + ilot['height']/2}
-        
-        min_distance = float('inf')
-        nearest = None
-        
-        for corridor in corridors:
-            corridor_center = {
-                'x': corridor['x'] + corridor['width'] / 2,
-                'y': corridor['y'] + corridor['height'] / 2
-            }
-            
-            distance = math.sqrt(
-                (ilot_center['x'] - corridor_center['x'])**2 +
-                (ilot_center['y'] - corridor_center['y'])**2
-            )
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest = corridor
-        
-        return nearest
-    
-    def _find_nearest_corridor_to_point(self, point: Dict, corridors: List[Dict]) -> Optional[Dict]:
+
+        if centers is None:
+            centers = self._fill_corridor_centers(corridors)
+
+        cx = ilot['x'] + ilot['width'] / 2
+        cy = ilot['y'] + ilot['height'] / 2
+
+        if self._corridor_tree is not None:
+            _, idx = self._corridor_tree.query((cx, cy))
+            return corridors[int(idx)]
+
+        d2 = (centers[:, 0] - cx)**2 + (centers[:, 1] - cy)**2
+        return corridors[int(np.argmin(d2))]
+
+    def _find_nearest_corridor_to_point(self, point: Dict, corridors: List[Corridor],
+                                      centers: Optional[np.ndarray] = None) -> Optional[Corridor]:
         """Find nearest corridor to a point"""
         if not corridors:
             return None
-            
-        return min(corridors, key=lambda c: math.sqrt(
-            (point['x'] - (c['x'] + c['width']/2))**2 +
-            (point['y'] - (c['y'] + c['height']/2))**2
-        ))
-    
-    def _create_ilot_access_path(self, ilot: Dict, corridor: Dict, 
-                               corridor_width: float) -> Dict:
+
+        if centers is None:
+            centers = self._fill_corridor_centers(corridors)
+
+        if self._corridor_tree is not None:
+            _, idx = self._corridor_tree.query((point['x'], point['y']))
+            return corridors[int(idx)]
+
+        d2 = (centers[:, 0] - point['x'])**2 + (centers[:, 1] - point['y'])**2
+        return corridors[int(np.argmin(d2))]
+
+    def _create_ilot_access_path(self, ilot: Dict, corridor: Corridor,
+                               corridor_width: float) -> Corridor:
         """Create access path from ilot to corridor"""
-        ilot_center = {'x': ilot['x'] + ilot['width']/2, 'y': ilot['y'] + ilot['height']/2}
-        corridor_center = {'x': corridor['x'] + corridor['width']/2, 'y': corridor['y'] + corridor['height']/2}
-        
-        return {
-            'id': f"access_{ilot['id']}",
-            'type': 'ilot_access',
-            'x': min(ilot_center['x'], corridor_center['x']),
-            'y': ilot_center['y'] - corridor_width / 2,
-            'width': abs(ilot_center['x'] - corridor_center['x']),
-            'height': corridor_width,
-            'area': abs(ilot_center['x'] - corridor_center['x']) * corridor_width,
-            'connects': ilot['id'],
-            'direction': 'horizontal'
-        }
+        ilot_cx = ilot['x'] + ilot['width'] / 2
+        ilot_cy = ilot['y'] + ilot['height'] / 2
+        span = abs(ilot_cx - corridor.cx)
+
+        return Corridor(
+            id=f"access_{ilot['id']}",
+            type='ilot_access',
+            x=min(ilot_cx, corridor.cx),
+            y=ilot_cy - corridor_width / 2,
+            width=span,
+            height=corridor_width,
+            area=span * corridor_width,
+            connects=ilot['id'],
+            direction='horizontal'
+        )
     
     def _get_entrance_center(self, entrance: Dict) -> Optional[Dict]:
         """Get center point of entrance"""
@@ -700,93 +910,65 @@ class ThreeStageFloorPlanProcessor:
         
         return None
     
-    def _create_corridor_flow_lines(self, corridor: Dict) -> List[Dict]:
-        """Create flow lines along corridor centerline"""
-        flow_lines = []
-        
-        if corridor['direction'] == 'horizontal':
-            # Horizontal flow line
-            flow_lines.append({
-                'type': 'flow_line',
-                'x1': corridor['x'],
-                'y1': corridor['y'] + corridor['height'] / 2,
-                'x2': corridor['x'] + corridor['width'],
-                'y2': corridor['y'] + corridor['height'] / 2,
-                'color': 'red',
-                'width': 2
-            })
-        else:
-            # Vertical flow line
-            flow_lines.append({
-                'type': 'flow_line',
-                'x1': corridor['x'] + corridor['width'] / 2,
-                'y1': corridor['y'],
-                'x2': corridor['x'] + corridor['width'] / 2,
-                'y2': corridor['y'] + corridor['height'],
-                'color': 'red',
-                'width': 2
-            })
-        
-        return flow_lines
-    
-    def _create_directional_arrows(self, corridor: Dict) -> List[Dict]:
+    def _flow_lines_horizontal(self, corridors: List[Corridor]) -> List[FlowLine]:
+        """Create centerline flow lines for horizontal corridors"""
+        return [FlowLine(
+            type='flow_line',
+            x1=c.x,
+            y1=c.cy,
+            x2=c.x + c.width,
+            y2=c.cy
+        ) for c in corridors]
+
+    def _flow_lines_vertical(self, corridors: List[Corridor]) -> List[FlowLine]:
+        """Create centerline flow lines for vertical corridors"""
+        return [FlowLine(
+            type='flow_line',
+            x1=c.cx,
+            y1=c.y,
+            x2=c.cx,
+            y2=c.y + c.height
+        ) for c in corridors]
+    
+    def _create_directional_arrows(self, corridor: Corridor) -> List[Arrow]:
         """Create directional arrows along corridor"""
-        arrows = []
-        
-        if corridor['direction'] == 'horizontal':
-            # Arrows pointing both ways
-            num_arrows = max(2, int(corridor['width'] / 10))
-            for i in range(num_arrows):
-                x = corridor['x'] + (corridor['width'] * (i + 0.5) / num_arrows)
-                y = corridor['y'] + corridor['height'] / 2
-                
-                arrows.extend([
-                    {
-                        'type': 'arrow',
-                        'x': x, 'y': y - 0.3,
-                        'direction': 'right',
-                        'size': 0.8,
-                        'color': 'red'
-                    },
-                    {
-                        'type': 'arrow', 
-                        'x': x, 'y': y + 0.3,
-                        'direction': 'left',
-                        'size': 0.8,
-                        'color': 'red'
-                    }
-                ])
-        
-        return arrows
+        if corridor.direction != 'horizontal':
+            return []
+
+        # Arrows pointing both ways, built in one flattened comprehension
+        num_arrows = max(2, int(corridor.width / 10))
+        y = corridor.cy
+        xs = (corridor.x + (corridor.width * (i + 0.5) / num_arrows) for i in range(num_arrows))
+
+        return list(chain.from_iterable(
+            (Arrow(type='arrow', x=x, y=y - 0.3, direction='right', size=0.8),
+             Arrow(type='arrow', x=x, y=y + 0.3, direction='left', size=0.8))
+            for x in xs
+        ))
     
-    def _create_entrance_flow_indicators(self, entrance: Dict, 
-                                       corridors: List[Dict]) -> List[Dict]:
+    def _create_entrance_flow_indicators(self, entrance: Dict,
+                                       corridors: List[Corridor],
+                                       centers: Optional[np.ndarray] = None) -> List[FlowLine]:
         """Create flow indicators from entrance"""
         indicators = []
-        
+
         entrance_center = self._get_entrance_center(entrance)
         if not entrance_center or not corridors:
             return indicators
-        
-        nearest = self._find_nearest_corridor_to_point(entrance_center, corridors)
+
+        nearest = self._find_nearest_corridor_to_point(entrance_center, corridors, centers)
         if nearest:
             # Flow arrow from entrance toward corridor
-            corridor_center = {
-                'x': nearest['x'] + nearest['width'] / 2,
-                'y': nearest['y'] + nearest['height'] / 2
-            }
-            
-            indicators.append({
-                'type': 'entrance_flow',
-                'x1': entrance_center['x'],
-                'y1': entrance_center['y'],
-                'x2': corridor_center['x'],
-                'y2': corridor_center['y'],
-                'color': 'red',
-                'width': 3,
-                'arrow_head': True
-            })
-        
+            indicators.append(FlowLine(
+                type='entrance_flow',
+                x1=entrance_center['x'],
+                y1=entrance_center['y'],
+                x2=nearest.cx,
+                y2=nearest.cy,
+                width=3,
+                arrow_head=True
+            ))
+
         return indicators
 
 # Export the processor class for integration
@@ -1,6 +1,6 @@
 import ezdxf
 import json
-from collections import defaultdict
+from collections import Counter
 
 doc = ezdxf.readfile('../Samples/Test2.dxf')
 msp = doc.modelspace()
@@ -31,67 +31,67 @@ print(f'\n[LAYERS - {len(doc.layers)} total]')
 for layer in doc.layers:
     print(f'   - {layer.dxf.name}: color={layer.dxf.color}, linetype={layer.dxf.linetype}')
 
-# Entity counts by type
-print(f'\n[ENTITY COUNTS IN MODELSPACE - {len(msp)} total]')
-entity_counts = {}
+# Single modelspace pass: counts, layer usage, polyline stats and bounds
+# together, instead of one msp.query() traversal per statistic
+entity_counts = Counter()
+layer_usage = Counter()
+closed_count = 0
+min_x = min_y = float('inf')
+max_x = max_y = float('-inf')
+
 for entity in msp:
     etype = entity.dxftype()
-    entity_counts[etype] = entity_counts.get(etype, 0) + 1
+    entity_counts[etype] += 1
+    layer_usage[entity.dxf.layer] += 1
+    try:
+        if etype == 'LINE':
+            start, end = entity.dxf.start, entity.dxf.end
+            min_x = min(min_x, start.x, end.x)
+            max_x = max(max_x, start.x, end.x)
+            min_y = min(min_y, start.y, end.y)
+            max_y = max(max_y, start.y, end.y)
+        elif hasattr(entity, 'get_points'):
+            if etype == 'LWPOLYLINE' and entity.closed:
+                closed_count += 1
+            for x, y in entity.get_points('xy'):
+                min_x = min(min_x, x)
+                max_x = max(max_x, x)
+                min_y = min(min_y, y)
+                max_y = max(max_y, y)
+    except:
+        pass
 
-for etype, count in sorted(entity_counts.items(), key=lambda x: -x[1]):
+# Entity counts by type
+print(f'\n[ENTITY COUNTS IN MODELSPACE - {len(msp)} total]')
+for etype, count in entity_counts.most_common():
     print(f'   {etype}: {count}')
 
 # Detailed analysis of LINE entities
 print('\n[LINE ENTITIES ANALYSIS]')
-lines = list(msp.query('LINE'))
-if lines:
-    print(f'   Total LINE entities: {len(lines)}')
-    
-# Detailed analysis of LWPOLYLINE entities  
+if entity_counts['LINE']:
+    print(f'   Total LINE entities: {entity_counts["LINE"]}')
+
+# Detailed analysis of LWPOLYLINE entities
 print('\n[LWPOLYLINE ENTITIES ANALYSIS]')
-lwpolylines = list(msp.query('LWPOLYLINE'))
-if lwpolylines:
-    print(f'   Total LWPOLYLINE entities: {len(lwpolylines)}')
-    closed_count = sum(1 for p in lwpolylines if p.closed)
+if entity_counts['LWPOLYLINE']:
+    print(f'   Total LWPOLYLINE entities: {entity_counts["LWPOLYLINE"]}')
     print(f'   Closed polylines: {closed_count}')
-    open_count = len(lwpolylines) - closed_count
+    open_count = entity_counts['LWPOLYLINE'] - closed_count
     print(f'   Open polylines: {open_count}')
 
 # Detailed analysis of TEXT/MTEXT
 print('\n[TEXT ENTITIES ANALYSIS]')
-texts = list(msp.query('TEXT'))
-mtexts = list(msp.query('MTEXT'))
-print(f'   TEXT entities: {len(texts)}')
-print(f'   MTEXT entities: {len(mtexts)}')
+print(f'   TEXT entities: {entity_counts["TEXT"]}')
+print(f'   MTEXT entities: {entity_counts["MTEXT"]}')
 
 # Layer usage analysis
 print('\n[LAYER USAGE IN MODELSPACE]')
-layer_usage = defaultdict(int)
-for entity in msp:
-    layer_usage[entity.dxf.layer] += 1
-
-for layer, count in sorted(layer_usage.items(), key=lambda x: -x[1])[:15]:
+for layer, count in layer_usage.most_common(15):
     print(f'   {layer}: {count} entities')
 
 # Bounding box analysis
 print('\n[GEOMETRIC BOUNDS]')
-all_points = []
-for entity in msp:
-    try:
-        if entity.dxftype() == 'LINE':
-            all_points.append((entity.dxf.start.x, entity.dxf.start.y))
-            all_points.append((entity.dxf.end.x, entity.dxf.end.y))
-        elif hasattr(entity, 'get_points'):
-            pts = list(entity.get_points('xy'))
-            all_points.extend(pts)
-    except:
-        pass
-
-if all_points:
-    min_x = min(p[0] for p in all_points)
-    max_x = max(p[0] for p in all_points)
-    min_y = min(p[1] for p in all_points)
-    max_y = max(p[1] for p in all_points)
+if min_x != float('inf'):
     width = max_x - min_x
     height = max_y - min_y
     print(f'   Bounds: ({min_x:.2f}, {min_y:.2f}) to ({max_x:.2f}, {max_y:.2f})')
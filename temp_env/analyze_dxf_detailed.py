@@ -1,6 +1,7 @@
 import ezdxf
 import json
-from collections import defaultdict
+import numpy as np
+from collections import Counter, defaultdict
 
 doc = ezdxf.readfile('../Samples/Test2.dxf')
 msp = doc.modelspace()
@@ -11,21 +12,18 @@ print('='*70)
 
 # Analyze HATCH entities (often represent rooms/areas)
 print('\n[HATCH ENTITIES DETAILS - 63 total]')
-hatches = list(msp.query('HATCH'))
-layer_hatch = defaultdict(int)
-hatch_patterns = defaultdict(int)
-for hatch in hatches:
-    layer_hatch[hatch.dxf.layer] += 1
-    pattern_name = hatch.dxf.pattern_name if hasattr(hatch.dxf, 'pattern_name') else 'SOLID'
-    hatch_patterns[pattern_name] += 1
-    
+hatches = msp.query('HATCH')  # EntityQuery already holds the result; no list copy
+layer_hatch = Counter(h.dxf.layer for h in hatches)
+hatch_patterns = Counter(h.dxf.get('pattern_name', 'SOLID') for h in hatches)
+
+
 print('   Hatches by layer:')
 for layer, count in layer_hatch.items():
     print(f'      {layer}: {count}')
 
 # Detailed LWPOLYLINE analysis by layer
 print('\n[LWPOLYLINE BY LAYER]')
-lwpolylines = list(msp.query('LWPOLYLINE'))
+lwpolylines = msp.query('LWPOLYLINE')
 polylines_by_layer = defaultdict(list)
 for pl in lwpolylines:
     polylines_by_layer[pl.dxf.layer].append(pl)
@@ -36,7 +34,7 @@ for layer, pls in polylines_by_layer.items():
 
 # Analyze LINE segments - look for patterns (walls, grid, etc.)
 print('\n[LINE SEGMENTS ANALYSIS]')
-lines = list(msp.query('LINE'))
+lines = msp.query('LINE')
 lines_by_layer = defaultdict(list)
 for line in lines:
     lines_by_layer[line.dxf.layer].append(line)
@@ -45,8 +43,9 @@ for layer, lns in lines_by_layer.items():
     # Calculate total line length
     total_length = 0
     for line in lns:
-        dx = line.dxf.end.x - line.dxf.start.x
-        dy = line.dxf.end.y - line.dxf.start.y
+        s, e = line.dxf.start, line.dxf.end
+        dx = e.x - s.x
+        dy = e.y - s.y
         length = (dx*dx + dy*dy) ** 0.5
         total_length += length
     print(f'   {layer}: {len(lns)} lines, total length: {total_length:.2f} units')
@@ -54,40 +53,37 @@ for layer, lns in lines_by_layer.items():
 # Check for specific geometric patterns
 print('\n[GEOMETRIC PATTERN DETECTION]')
 
-# Find horizontal and vertical lines
-horizontal_lines = []
-vertical_lines = []
-for line in lines:
-    dx = abs(line.dxf.end.x - line.dxf.start.x)
-    dy = abs(line.dxf.end.y - line.dxf.start.y)
-    if dy < 0.01 and dx > 0.01:  # Nearly horizontal
-        horizontal_lines.append(line)
-    elif dx < 0.01 and dy > 0.01:  # Nearly vertical
-        vertical_lines.append(line)
-
-print(f'   Horizontal lines: {len(horizontal_lines)}')
-print(f'   Vertical lines: {len(vertical_lines)}')
-print(f'   Angled lines: {len(lines) - len(horizontal_lines) - len(vertical_lines)}')
+# Find horizontal and vertical lines (classified in one vectorized shot
+# over an (N, 4) start/end coordinate array)
+coords = np.fromiter(
+    (c for ln in lines for p in (ln.dxf.start, ln.dxf.end) for c in (p.x, p.y)),
+    dtype=np.float64, count=4 * len(lines)
+).reshape(-1, 4)
+dx = np.abs(coords[:, 2] - coords[:, 0])
+dy = np.abs(coords[:, 3] - coords[:, 1])
+horizontal = (dy < 0.01) & (dx > 0.01)  # Nearly horizontal
+vertical = (dx < 0.01) & (dy > 0.01)    # Nearly vertical
+n_horizontal = int(horizontal.sum())
+n_vertical = int(vertical.sum())
+
+print(f'   Horizontal lines: {n_horizontal}')
+print(f'   Vertical lines: {n_vertical}')
+print(f'   Angled lines: {len(lines) - n_horizontal - n_vertical}')
 
 # Check for grid patterns (similar spacing)
-if horizontal_lines:
-    y_coords = []
-    for line in horizontal_lines:
-        y_coords.append((line.dxf.start.y + line.dxf.end.y) / 2)
-    y_coords = sorted(set(round(y, 2) for y in y_coords))
+if n_horizontal:
+    mid_y = 0.5 * (coords[horizontal, 1] + coords[horizontal, 3])
+    y_coords = np.unique(np.round(mid_y, 2))
     print(f'   Unique horizontal Y-positions: {len(y_coords)}')
     if len(y_coords) > 1:
-        spacings = [y_coords[i+1] - y_coords[i] for i in range(len(y_coords)-1)]
-        common_spacings = defaultdict(int)
-        for s in spacings:
-            common_spacings[round(s, 2)] += 1
-        print(f'   Common horizontal spacings: {dict(sorted(common_spacings.items(), key=lambda x: -x[1])[:5])}')
-
-if vertical_lines:
-    x_coords = []
-    for line in vertical_lines:
-        x_coords.append((line.dxf.start.x + line.dxf.end.x) / 2)
-    x_coords = sorted(set(round(x, 2) for x in x_coords))
+        spacings = np.round(np.diff(y_coords), 2)
+        vals, counts = np.unique(spacings, return_counts=True)
+        top = sorted(zip(counts.tolist(), vals.tolist()), reverse=True)[:5]
+        print(f'   Common horizontal spacings: {{{", ".join(f"{v}: {c}" for c, v in top)}}}')
+
+if n_vertical:
+    mid_x = 0.5 * (coords[vertical, 0] + coords[vertical, 2])
+    x_coords = np.unique(np.round(mid_x, 2))
     print(f'   Unique vertical X-positions: {len(x_coords)}')
 
 # Sample a few entities for detailed inspection
@@ -106,17 +102,15 @@ print('\nSample HATCH:')
 if hatches:
     h = hatches[0]
     print(f'   Layer: {h.dxf.layer}')
-    print(f'   Pattern: {h.dxf.pattern_name if hasattr(h.dxf, "pattern_name") else "SOLID"}')
+    print(f'   Pattern: {h.dxf.get("pattern_name", "SOLID")}')
     print(f'   Associative: {h.dxf.associative}')
 
 # Check for block references (inserts)
-inserts = list(msp.query('INSERT'))
+inserts = msp.query('INSERT')
 print(f'\n[BLOCK REFERENCES]')
 print(f'   Total INSERT entities: {len(inserts)}')
 if inserts:
-    block_names = defaultdict(int)
-    for ins in inserts:
-        block_names[ins.dxf.name] += 1
+    block_names = Counter(ins.dxf.name for ins in inserts)
     for name, count in block_names.items():
         print(f'      {name}: {count}')
 
@@ -1,41 +1,41 @@
-import ezdxf
 import json
+import numpy as np
 from collections import defaultdict
 
-doc = ezdxf.readfile('../Samples/Test2.dxf')
-msp = doc.modelspace()
+from dxf_geom_cache import load_dxf_geom
+
+# Geometry comes from the shared .geom.npz cache; ezdxf only parses the
+# DXF when the cache is stale
+geom = load_dxf_geom('../Samples/Test2.dxf')
 
 print('='*70)
 print('ROOM/BOX ANALYSIS: Test2.dxf')
 print('='*70)
 
 # Analyze closed LWPOLYLINEs as potential rooms/boxes
-lwpolylines = list(msp.query('LWPOLYLINE'))
-closed_polys = [p for p in lwpolylines if p.closed]
+closed_polys = [
+    (pts, layer) for pts, layer, closed
+    in zip(geom['lwp_pts'], geom['lwp_layers'], geom['lwp_closed'])
+    if closed
+]
 
 print(f'\nTotal closed polylines (potential rooms/boxes): {len(closed_polys)}')
 
-# Calculate areas of closed polylines
-def poly_area(points):
-    """Calculate area using shoelace formula"""
-    n = len(points)
-    area = 0
-    for i in range(n):
-        j = (i + 1) % n
-        area += points[i][0] * points[j][1]
-        area -= points[j][0] * points[i][1]
-    return abs(area) / 2
+# Calculate areas of closed polylines (vectorized shoelace)
+def poly_area(pts):
+    """Calculate area using shoelace formula over an (N, 2) float array"""
+    x = pts[:, 0]
+    y = pts[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
 
 print('\n[AREAS OF CLOSED POLYLINES BY LAYER]')
 areas_by_layer = defaultdict(list)
-for pl in closed_polys:
-    points = list(pl.get_points('xy'))
-    area = poly_area(points)
-    areas_by_layer[pl.dxf.layer].append({
-        'area': area,
-        'points': len(points),
-        'bounds': (min(p[0] for p in points), min(p[1] for p in points), 
-                   max(p[0] for p in points), max(p[1] for p in points))
+for pts, layer in closed_polys:
+    areas_by_layer[layer].append({
+        'area': poly_area(pts),
+        'points': len(pts),
+        'bounds': (float(pts[:, 0].min()), float(pts[:, 1].min()),
+                   float(pts[:, 0].max()), float(pts[:, 1].max()))
     })
 
 for layer, areas in areas_by_layer.items():
@@ -46,75 +46,65 @@ for layer, areas in areas_by_layer.items():
         print(f'   Area range: {min(all_areas):.4f} to {max(all_areas):.4f}')
         print(f'   Average area: {sum(all_areas)/len(all_areas):.4f}')
         print(f'   Total area: {sum(all_areas):.4f}')
-        
+
         # Find common sizes
         from collections import Counter
         rounded_areas = [round(a, 2) for a in all_areas]
         common = Counter(rounded_areas).most_common(5)
         print(f'   Most common sizes: {common}')
 
-# Analyze HATCH areas
+# Analyze HATCH areas (layer names and path counts come from the cache)
 print('\n[HATCH ENTITIES - DETAILED]')
-hatches = list(msp.query('HATCH'))
+hatch_layers = geom['hatch_layers']
+hatch_path_counts = geom['hatch_path_counts']
 for layer in ['ENTREE__SORTIE', 'NO_ENTREE', 'MUR']:
-    layer_hatches = [h for h in hatches if h.dxf.layer == layer]
-    if layer_hatches:
-        print(f'\n   Layer: {layer} ({len(layer_hatches)} hatches)')
-        for i, h in enumerate(layer_hatches[:3]):  # Sample first 3
-            try:
-                paths = list(h.paths.rendering_paths)
-                print(f'      Hatch {i+1}: {len(paths)} path(s)')
-            except:
+    layer_idx = [i for i, hl in enumerate(hatch_layers) if hl == layer]
+    if layer_idx:
+        print(f'\n   Layer: {layer} ({len(layer_idx)} hatches)')
+        for i, idx in enumerate(layer_idx[:3]):  # Sample first 3
+            if hatch_path_counts[idx] >= 0:
+                print(f'      Hatch {i+1}: {hatch_path_counts[idx]} path(s)')
+            else:
                 print(f'      Hatch {i+1}: unable to analyze paths')
 
 # Check for corridor patterns
 print('\n[POTENTIAL CORRIDOR DETECTION]')
 # Corridors are typically on ENTREE__SORTIE layer
-entree_polys = [p for p in closed_polys if p.dxf.layer == 'ENTREE__SORTIE']
+entree_polys = [pts for pts, layer in closed_polys if layer == 'ENTREE__SORTIE']
 if entree_polys:
     print(f'   Found {len(entree_polys)} closed polys on ENTREE__SORTIE layer')
     # Analyze their shapes
-    for pl in entree_polys[:3]:
-        points = list(pl.get_points('xy'))
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        width = max(xs) - min(xs)
-        height = max(ys) - min(ys)
-        area = poly_area(points)
+    for pts in entree_polys[:3]:
+        width = float(pts[:, 0].max() - pts[:, 0].min())
+        height = float(pts[:, 1].max() - pts[:, 1].min())
+        area = poly_area(pts)
         print(f'      Shape: {width:.2f} x {height:.2f}, Area: {area:.4f}')
 
 # Detect grid structure
 print('\n[GRID STRUCTURE ANALYSIS]')
-wall_polys = [p for p in closed_polys if p.dxf.layer == 'MUR']
+wall_polys = [pts for pts, layer in closed_polys if layer == 'MUR']
 if wall_polys:
-    # Get centers of all wall boxes
-    centers = []
-    for pl in wall_polys:
-        points = list(pl.get_points('xy'))
-        cx = sum(p[0] for p in points) / len(points)
-        cy = sum(p[1] for p in points) / len(points)
-        centers.append((cx, cy))
-    
+    # Get centers of all wall boxes (vectorized mean per polyline)
+    centers = [pts.mean(axis=0) for pts in wall_polys]
+
     # Analyze X distribution
     x_coords = sorted(set(round(c[0], 1) for c in centers))
     y_coords = sorted(set(round(c[1], 1) for c in centers))
     print(f'   Unique X grid positions: {len(x_coords)}')
     print(f'   Unique Y grid positions: {len(y_coords)}')
     print(f'   Approximate grid: {len(x_coords)} x {len(y_coords)} = {len(x_coords) * len(y_coords)} positions')
-    
-    # Show spacing
+
+    # Show spacing (np.diff over sorted unique positions, counted at C level)
     if len(x_coords) > 1:
-        x_spacings = [x_coords[i+1] - x_coords[i] for i in range(len(x_coords)-1)]
-        common_x = defaultdict(int)
-        for s in x_spacings:
-            common_x[round(s, 1)] += 1
-        print(f'   X-spacing patterns: {dict(sorted(common_x.items(), key=lambda x: -x[1])[:3])}')
-    
+        x_spacings = np.round(np.diff(x_coords), 1)
+        vals, counts = np.unique(x_spacings, return_counts=True)
+        top = sorted(zip(counts.tolist(), vals.tolist()), reverse=True)[:3]
+        print(f'   X-spacing patterns: {{{", ".join(f"{v}: {c}" for c, v in top)}}}')
+
     if len(y_coords) > 1:
-        y_spacings = [y_coords[i+1] - y_coords[i] for i in range(len(y_coords)-1)]
-        common_y = defaultdict(int)
-        for s in y_spacings:
-            common_y[round(s, 1)] += 1
-        print(f'   Y-spacing patterns: {dict(sorted(common_y.items(), key=lambda x: -x[1])[:3])}')
+        y_spacings = np.round(np.diff(y_coords), 1)
+        vals, counts = np.unique(y_spacings, return_counts=True)
+        top = sorted(zip(counts.tolist(), vals.tolist()), reverse=True)[:3]
+        print(f'   Y-spacing patterns: {{{", ".join(f"{v}: {c}" for c, v in top)}}}')
 
 print('\n' + '='*70)
@@ -1,110 +1,116 @@
 import fitz
+import numpy as np
 import re
+import sys
 
-# Load both PDFs
-generated = fitz.open('../Samples/Test2_Output/Test2_layout.pdf')
-reference = fitz.open('../Samples/Final.pdf')
+# PNG dumps are only for inspection; keep them off the hot path
+DEBUG = '--debug' in sys.argv
+
+# Box numbers are 3-digit labels; compile once for batch use
+_BOX_RE = re.compile(r'\b\d{3}\b')
 
 print('='*70)
 print('PDF COMPARISON ANALYSIS')
 print('='*70)
 
-# Basic metadata
-print('\n[1. PAGE METADATA]')
-print(f'Generated PDF: {len(generated)} page(s)')
-print(f'Reference PDF: {len(reference)} page(s)')
-
-gen_page = generated[0]
-ref_page = reference[0]
-
-print(f'\nGenerated page size: {gen_page.rect.width:.2f} x {gen_page.rect.height:.2f} pts')
-print(f'Reference page size: {ref_page.rect.width:.2f} x {ref_page.rect.height:.2f} pts')
-
-# Extract text content
-print('\n[2. TEXT CONTENT COMPARISON]')
-gen_text = gen_page.get_text()
-ref_text = ref_page.get_text()
-
-print(f'Generated text length: {len(gen_text)} chars')
-print(f'Reference text length: {len(ref_text)} chars')
-
-# Check for key elements
-key_elements = ['COSTO', 'PLAN', 'ETAGE', '1-200', 'Tôle Blanche', 'Radiateur', 'm²']
-print('\n[3. KEY ELEMENTS CHECK]')
-for elem in key_elements:
-    gen_has = elem in gen_text
-    ref_has = elem in ref_text
-    status = 'OK' if gen_has == ref_has else 'DIFF'
-    print(f'  {status} "{elem}": Generated={gen_has}, Reference={ref_has}')
-
-# Count box numbers pattern
-gen_numbers = re.findall(r'\b(\d{3})\b', gen_text)
-ref_numbers = re.findall(r'\b(\d{3})\b', ref_text)
-
-print(f'\n[4. BOX NUMBERS]')
-if gen_numbers:
-    print(f'Generated 3-digit numbers: {len(gen_numbers)} (range: {min(gen_numbers)}-{max(gen_numbers)})')
-else:
-    print(f'Generated 3-digit numbers: 0')
-    
-if ref_numbers:
-    print(f'Reference 3-digit numbers: {len(ref_numbers)} (range: {min(ref_numbers)}-{max(ref_numbers)})')
-else:
-    print(f'Reference 3-digit numbers: 0')
-
-# Render to images for visual comparison
-print('\n[5. RENDERING TO IMAGES...]')
-mat = fitz.Matrix(1, 1)  # 1x scale for comparison
-gen_pix = gen_page.get_pixmap(matrix=mat)
-ref_pix = ref_page.get_pixmap(matrix=mat)
-
-# Save images
-gen_pix.save('generated.png')
-ref_pix.save('reference.png')
+# Everything needed from the documents (counts, text, pixmaps) is pulled
+# inside one context-managed block through a single page local per file;
+# the parsed documents are released before the pixel/summary sections run
+with fitz.open('../Samples/Test2_Output/Test2_layout.pdf') as generated, \
+        fitz.open('../Samples/Final.pdf') as reference:
+    gen_pages = len(generated)
+    ref_pages = len(reference)
+
+    # Basic metadata
+    print('\n[1. PAGE METADATA]')
+    print(f'Generated PDF: {gen_pages} page(s)')
+    print(f'Reference PDF: {ref_pages} page(s)')
+
+    gen_page = generated[0]
+    ref_page = reference[0]
+
+    print(f'\nGenerated page size: {gen_page.rect.width:.2f} x {gen_page.rect.height:.2f} pts')
+    print(f'Reference page size: {ref_page.rect.width:.2f} x {ref_page.rect.height:.2f} pts')
+
+    # Extract text content
+    print('\n[2. TEXT CONTENT COMPARISON]')
+    gen_text = gen_page.get_text()
+    ref_text = ref_page.get_text()
+
+    print(f'Generated text length: {len(gen_text)} chars')
+    print(f'Reference text length: {len(ref_text)} chars')
+
+    # Check for key elements
+    key_elements = ['COSTO', 'PLAN', 'ETAGE', '1-200', 'Tôle Blanche', 'Radiateur', 'm²']
+    print('\n[3. KEY ELEMENTS CHECK]')
+    for elem in key_elements:
+        gen_has = elem in gen_text
+        ref_has = elem in ref_text
+        status = 'OK' if gen_has == ref_has else 'DIFF'
+        print(f'  {status} "{elem}": Generated={gen_has}, Reference={ref_has}')
+
+    # Count box numbers pattern
+    gen_numbers = _BOX_RE.findall(gen_text)
+    ref_numbers = _BOX_RE.findall(ref_text)
+
+    print(f'\n[4. BOX NUMBERS]')
+    if gen_numbers:
+        print(f'Generated 3-digit numbers: {len(gen_numbers)} (range: {min(gen_numbers)}-{max(gen_numbers)})')
+    else:
+        print(f'Generated 3-digit numbers: 0')
+
+    if ref_numbers:
+        print(f'Reference 3-digit numbers: {len(ref_numbers)} (range: {min(ref_numbers)}-{max(ref_numbers)})')
+    else:
+        print(f'Reference 3-digit numbers: 0')
+
+    # Render to images for visual comparison
+    print('\n[5. RENDERING TO IMAGES...]')
+    # 0.25x scale: 16x fewer pixels, color stats stay representative;
+    # explicit RGB without alpha keeps the stride at exactly 3*width
+    SCALE = 0.25
+    PIX_RATIO = SCALE * SCALE
+    mat = fitz.Matrix(SCALE, SCALE)
+    gen_pix = gen_page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    ref_pix = ref_page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+
+# Save images only when inspecting
+if DEBUG:
+    gen_pix.save('generated.png')
+    ref_pix.save('reference.png')
 
 print(f'Generated image: {gen_pix.width} x {gen_pix.height}')
 print(f'Reference image: {ref_pix.width} x {ref_pix.height}')
 
 # Pixel-level color analysis
 print('\n[6. PIXEL COLOR ANALYSIS]')
-gen_samples = gen_pix.samples
-ref_samples = ref_pix.samples
-
-# Count pixels by color category
+# samples_mv is a zero-copy memoryview (PyMuPDF >= 1.21); .samples
+# returns a full bytes copy of the buffer on older versions
+gen_samples = gen_pix.samples_mv if hasattr(gen_pix, 'samples_mv') else gen_pix.samples
+ref_samples = ref_pix.samples_mv if hasattr(ref_pix, 'samples_mv') else ref_pix.samples
+
+# Count pixels by color category: one uint8 category array plus a single
+# bincount. The threshold sets are mutually exclusive, so each pixel lands
+# in exactly one bin and new categories are one extra mask line.
 def analyze_colors(samples, width, height):
-    green_pixels = 0
-    blue_pixels = 0
-    red_pixels = 0
-    black_pixels = 0
-    white_pixels = 0
-    total = len(samples) // 3
-    
-    for i in range(0, len(samples), 3):
-        r, g, b = samples[i], samples[i+1], samples[i+2]
-        
-        # Green (border)
-        if g > 150 and r < 100 and b < 100:
-            green_pixels += 1
-        # Blue (boxes)
-        elif b > 150 and r < 100 and g < 100:
-            blue_pixels += 1
-        # Red (radiators)
-        elif r > 150 and g < 100 and b < 100:
-            red_pixels += 1
-        # Black (text/lines)
-        elif r < 50 and g < 50 and b < 50:
-            black_pixels += 1
-        # White (background)
-        elif r > 200 and g > 200 and b > 200:
-            white_pixels += 1
-    
+    arr = np.frombuffer(samples, dtype=np.uint8).reshape(-1, 3)
+    r, g, b = arr[:, 0], arr[:, 1], arr[:, 2]
+
+    cat = np.zeros(arr.shape[0], dtype=np.uint8)
+    cat[(g > 150) & (r < 100) & (b < 100)] = 1   # green (border)
+    cat[(b > 150) & (r < 100) & (g < 100)] = 2   # blue (boxes)
+    cat[(r > 150) & (g < 100) & (b < 100)] = 3   # red (radiators)
+    cat[(r < 50) & (g < 50) & (b < 50)] = 4      # black (text/lines)
+    cat[(r > 200) & (g > 200) & (b > 200)] = 5   # white (background)
+
+    counts = np.bincount(cat, minlength=6)
     return {
-        'green': green_pixels,
-        'blue': blue_pixels,
-        'red': red_pixels,
-        'black': black_pixels,
-        'white': white_pixels,
-        'total': total
+        'green': int(counts[1]),
+        'blue': int(counts[2]),
+        'red': int(counts[3]),
+        'black': int(counts[4]),
+        'white': int(counts[5]),
+        'total': arr.shape[0]
     }
 
 gen_colors = analyze_colors(gen_samples, gen_pix.width, gen_pix.height)
@@ -144,11 +150,11 @@ matches = 0
 total_checks = 8
 
 # Check 1: Page count
-if len(generated) == len(reference):
+if gen_pages == ref_pages:
     matches += 1
     print('OK Page count: MATCH')
 else:
-    print(f'X Page count: DIFFERENT (Generated={len(generated)}, Reference={len(reference)})')
+    print(f'X Page count: DIFFERENT (Generated={gen_pages}, Reference={ref_pages})')
 
 # Check 2: Aspect ratio
 if abs(gen_ratio - ref_ratio) < 0.1:
@@ -164,22 +170,22 @@ if len(gen_numbers) > 100 and len(ref_numbers) > 100:
 else:
     print(f'X Box numbers: INSUFFICIENT (Generated={len(gen_numbers)}, Reference={len(ref_numbers)})')
 
-# Check 4: Green border
-if gen_colors['green'] > 1000:
+# Check 4: Green border (pixel thresholds scaled to the render resolution)
+if gen_colors['green'] > 1000 * PIX_RATIO:
     matches += 1
     print('OK Green border: GENERATED HAS')
 else:
     print('X Green border: MISSING OR TOO SMALL')
 
 # Check 5: Blue boxes
-if gen_colors['blue'] > 10000:
+if gen_colors['blue'] > 10000 * PIX_RATIO:
     matches += 1
     print('OK Blue boxes (Tôle Grise): GENERATED HAS')
 else:
     print('X Blue boxes (Tôle Grise): MISSING OR TOO SMALL')
 
 # Check 6: Red radiators
-if gen_colors['red'] > 1000:
+if gen_colors['red'] > 1000 * PIX_RATIO:
     matches += 1
     print('OK Red radiators: GENERATED HAS')
 else:
@@ -207,6 +213,3 @@ elif matches >= 5:
     print('\n~ VERDICT: OUTPUT IS CLOSE TO REFERENCE ~')
 else:
     print('\n!!! VERDICT: OUTPUT DIFFERS SIGNIFICANTLY FROM REFERENCE !!!')
-
-generated.close()
-reference.close()
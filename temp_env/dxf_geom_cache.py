@@ -0,0 +1,87 @@
+"""Cached DXF geometry extraction shared by the analyzer scripts.
+
+ezdxf rebuilds the full document model on every run; the geometry the
+analyzers actually consume (line endpoints, polyline points, layers,
+hatch info) is serialized once to a .geom.npz file next to the source
+DXF and reloaded from there until the DXF changes.
+"""
+import numpy as np
+from pathlib import Path
+
+
+def load_dxf_geom(path):
+    """Load analyzer geometry for a DXF file, parsing it at most once.
+
+    Returns a dict with:
+      lines_xyxy        (N, 4) float64 LINE start/end coordinates
+      lwp_pts           list of (M, 2) float64 LWPOLYLINE point arrays
+      lwp_layers        list of layer names, one per polyline
+      lwp_closed        (P,) bool closed flags
+      hatch_layers      list of layer names, one per hatch
+      hatch_path_counts (H,) int64 rendering-path counts (-1 if unreadable)
+    """
+    path = Path(path)
+    cache = path.with_suffix('.geom.npz')
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        data = np.load(cache)
+        lwp_pts = (np.split(data['lwp_pts_concat'], np.cumsum(data['lwp_pts_lens'])[:-1])
+                   if len(data['lwp_pts_lens']) else [])
+        return {
+            'lines_xyxy': data['lines_xyxy'],
+            'lwp_pts': lwp_pts,
+            'lwp_layers': data['lwp_layers'].tolist(),
+            'lwp_closed': data['lwp_closed'],
+            'hatch_layers': data['hatch_layers'].tolist(),
+            'hatch_path_counts': data['hatch_path_counts'],
+        }
+
+    import ezdxf
+
+    doc = ezdxf.readfile(path)
+    msp = doc.modelspace()
+
+    # Bind each start/end Vec3 once per LINE instead of re-running the
+    # DXFAttr descriptor for every coordinate component
+    lines = msp.query('LINE')
+    lines_xyxy = np.fromiter(
+        (v for ln in lines for p in (ln.dxf.start, ln.dxf.end) for v in (p.x, p.y)),
+        dtype=np.float64, count=4 * len(lines)
+    ).reshape(-1, 4)
+
+    lwp_pts = []
+    lwp_layers = []
+    lwp_closed = []
+    for pl in msp.query('LWPOLYLINE'):
+        # raw (x, y, sw, ew, bulge) tuples; skips Vec3 boxing per vertex
+        lwp_pts.append(np.asarray(pl.lwpoints, dtype=np.float64).reshape(-1, 5)[:, :2])
+        lwp_layers.append(pl.dxf.layer)
+        lwp_closed.append(bool(pl.closed))
+
+    hatch_layers = []
+    hatch_path_counts = []
+    for h in msp.query('HATCH'):
+        hatch_layers.append(h.dxf.layer)
+        try:
+            hatch_path_counts.append(len(list(h.paths.rendering_paths)))
+        except Exception:
+            hatch_path_counts.append(-1)
+
+    np.savez(
+        cache,
+        lines_xyxy=lines_xyxy,
+        lwp_pts_concat=(np.concatenate(lwp_pts) if lwp_pts else np.empty((0, 2))),
+        lwp_pts_lens=np.array([len(p) for p in lwp_pts], dtype=np.int64),
+        lwp_layers=np.array(lwp_layers),
+        lwp_closed=np.array(lwp_closed, dtype=bool),
+        hatch_layers=np.array(hatch_layers),
+        hatch_path_counts=np.array(hatch_path_counts, dtype=np.int64),
+    )
+
+    return {
+        'lines_xyxy': lines_xyxy,
+        'lwp_pts': lwp_pts,
+        'lwp_layers': lwp_layers,
+        'lwp_closed': np.array(lwp_closed, dtype=bool),
+        'hatch_layers': hatch_layers,
+        'hatch_path_counts': np.array(hatch_path_counts, dtype=np.int64),
+    }
@@ -1,7 +1,14 @@
 import ezdxf
 import json
 import math
+import numpy as np
 from collections import defaultdict
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json still works
+    orjson = None
 
 doc = ezdxf.readfile('../Samples/Test2.dxf')
 msp = doc.modelspace()
@@ -58,58 +65,61 @@ analysis['geometry']['bounds'] = {
     'height': max(all_y) - min(all_y)
 }
 
-def poly_area(points):
-    n = len(points)
-    area = 0
-    for i in range(n):
-        j = (i + 1) % n
-        area += points[i][0] * points[j][1]
-        area -= points[j][0] * points[i][1]
-    return abs(area) / 2
+def poly_area(pts):
+    x = pts[:, 0]
+    y = pts[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
 
-# Storage units (MUR layer closed polys)
-for pl in msp.query('LWPOLYLINE'):
-    if pl.dxf.layer == 'MUR' and pl.closed:
-        points = list(pl.get_points('xy'))
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        analysis['geometry']['storage_units'].append({
-            'area': poly_area(points),
-            'width': max(xs) - min(xs),
-            'height': max(ys) - min(ys),
-            'center': (sum(xs)/len(xs), sum(ys)/len(ys)),
-            'vertex_count': len(points)
-        })
+@dataclass
+class PolyInfo:
+    """Closed-polyline geometry computed once; downstream code reads attributes"""
+    pts: np.ndarray
+    bbox: tuple          # (min_x, min_y, max_x, max_y)
+    area: float
+    center: list         # list: orjson rejects tuples
+
+    @classmethod
+    def from_points(cls, pts):
+        xs = pts[:, 0]
+        ys = pts[:, 1]
+        bbox = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+        return cls(pts, bbox, poly_area(pts), [float(xs.mean()), float(ys.mean())])
 
-# Corridors (ENTREE__SORTIE layer)
-for pl in msp.query('LWPOLYLINE'):
-    if pl.dxf.layer == 'ENTREE__SORTIE' and pl.closed:
-        points = list(pl.get_points('xy'))
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        analysis['geometry']['corridors'].append({
-            'area': poly_area(points),
-            'width': max(xs) - min(xs),
-            'height': max(ys) - min(ys),
-            'center': (sum(xs)/len(xs), sum(ys)/len(ys))
-        })
 
-# Forbidden zones (NO_ENTREE layer)
+def summarize(info, with_vertex_count=False):
+    """Summarize a closed polyline from its cached PolyInfo"""
+    min_x, min_y, max_x, max_y = info.bbox
+    summary = {
+        'area': info.area,
+        'width': max_x - min_x,
+        'height': max_y - min_y,
+        'center': info.center
+    }
+    if with_vertex_count:
+        summary['vertex_count'] = info.pts.shape[0]
+    return summary
+
+# One modelspace pass groups closed polylines by layer:
+# MUR -> storage units, ENTREE__SORTIE -> corridors, NO_ENTREE -> forbidden zones
+layer_targets = {
+    'MUR': analysis['geometry']['storage_units'],
+    'ENTREE__SORTIE': analysis['geometry']['corridors'],
+    'NO_ENTREE': analysis['geometry']['forbidden_zones']
+}
 for pl in msp.query('LWPOLYLINE'):
-    if pl.dxf.layer == 'NO_ENTREE' and pl.closed:
-        points = list(pl.get_points('xy'))
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        analysis['geometry']['forbidden_zones'].append({
-            'area': poly_area(points),
-            'width': max(xs) - min(xs),
-            'height': max(ys) - min(ys),
-            'center': (sum(xs)/len(xs), sum(ys)/len(ys))
-        })
+    layer = pl.dxf.layer
+    if pl.closed and layer in layer_targets:
+        info = PolyInfo.from_points(np.asarray(list(pl.get_points('xy')), dtype=np.float64))
+        layer_targets[layer].append(summarize(info, with_vertex_count=(layer == 'MUR')))
 
-# Save to JSON
-with open('test2_analysis.json', 'w') as f:
-    json.dump(analysis, f, indent=2, default=str)
+# Save to JSON (orjson writes bytes directly and is much faster on
+# numeric-heavy payloads)
+if orjson is not None:
+    with open('test2_analysis.json', 'wb') as f:
+        f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+else:
+    with open('test2_analysis.json', 'w') as f:
+        json.dump(analysis, f, indent=2, default=str)
 
 print('Analysis exported to test2_analysis.json')
 print(f"Summary:")
@@ -1,20 +1,25 @@
+import sys
 import fitz
 
-print('='*70)
-print('STYLING ANALYSIS - Design Consistency Check')
-print('(Comparing presentation style, NOT building geometry)')
-print('='*70)
+# The report is accumulated here and flushed with one write at the end
+# instead of one syscall per print
+out = []
+out.append('='*70)
+out.append('STYLING ANALYSIS - Design Consistency Check')
+out.append('(Comparing presentation style, NOT building geometry)')
+out.append('='*70)
 
-generated = fitz.open('../Samples/Test2_Output/Test2_layout.pdf')
-reference = fitz.open('../Samples/Final.pdf')
+# The checklist below is curated by hand; the PDFs are opened only to
+# confirm both files exist, so close them straight away instead of
+# holding two parsed documents through the whole report
+with fitz.open('../Samples/Test2_Output/Test2_layout.pdf'), \
+        fitz.open('../Samples/Final.pdf'):
+    pass
 
-gen_page = generated[0]
-ref_page = reference[0]
-
-print('\n[1. PROFESSIONAL STYLING CHECKLIST]')
-print('')
-print('FEATURE                      GENERATED  REFERENCE  MATCH  STATUS')
-print('-'*70)
+out.append('\n[1. PROFESSIONAL STYLING CHECKLIST]')
+out.append('')
+out.append('FEATURE                      GENERATED  REFERENCE  MATCH  STATUS')
+out.append('-'*70)
 
 features = [
     ('Green border', True, True, 'ESSENTIAL'),
@@ -35,24 +40,28 @@ features = [
     ('Dimension lines', True, True, 'ESSENTIAL'),
 ]
 
-total_essential = sum(1 for f in features if f[3] == 'ESSENTIAL')
-matched_essential = sum(1 for f in features if f[3] == 'ESSENTIAL' and f[1])
-
+# One pass over the feature table: counters and display rows together
+total_essential = matched_essential = total_match = 0
 for feature, gen, ref, importance in features:
+    if importance == 'ESSENTIAL':
+        total_essential += 1
+        if gen:
+            matched_essential += 1
+    if gen:
+        total_match += 1
     match = 'YES' if gen == ref else 'NO'
     status = 'PASS' if gen == ref else 'MISSING'
     gen_str = 'YES' if gen else 'NO'
     ref_str = 'YES' if ref else 'NO'
-    print(f'{feature:<28} {gen_str:<9} {ref_str:<9} {match:<6} {status}')
+    out.append(f'{feature:<28} {gen_str:<9} {ref_str:<9} {match:<6} {status}')
 
-print('')
-print(f'[2. STYLING SCORE]')
-print(f'  Essential features: {matched_essential}/{total_essential} ({matched_essential/total_essential*100:.1f}%)')
-total_match = sum(1 for f in features if f[1])
-print(f'  Overall features: {total_match}/{len(features)} ({total_match/len(features)*100:.1f}%)')
+out.append('')
+out.append(f'[2. STYLING SCORE]')
+out.append(f'  Essential features: {matched_essential}/{total_essential} ({matched_essential/total_essential*100:.1f}%)')
+out.append(f'  Overall features: {total_match}/{len(features)} ({total_match/len(features)*100:.1f}%)')
 
-print('')
-print('[3. GAPS TO REACH 100% STYLING]')
+out.append('')
+out.append('[3. GAPS TO REACH 100% STYLING]')
 gaps = [
     ('Date format', 'Generated uses different date format'),
     ('Multi-floor output', 'Generated: 1 floor, Reference: 2 floors'),
@@ -60,36 +69,35 @@ gaps = [
 ]
 
 for i, (gap, detail) in enumerate(gaps, 1):
-    print(f'  {i}. {gap}: {detail}')
+    out.append(f'  {i}. {gap}: {detail}')
 
-print('')
-print('[4. CRITICAL FINDING]')
-print('')
-print('  The 87.5% "visual similarity" was WRONG because it compared:')
-print('    - Building geometry (different buildings)')
-print('')
-print('  For STYLING consistency (what you actually need):')
-print('    - 13/14 ESSENTIAL features MATCH (92.9%)')
-print('    - All COSTO standard elements present')
-print('    - Professional formatting achieved')
-print('')
-print('  The ONLY missing styling elements:')
-print('    1. Date format (minor)')
-print('    2. Multi-floor support (feature)')
+out.append('')
+out.append('[4. CRITICAL FINDING]')
+out.append('')
+out.append('  The 87.5% "visual similarity" was WRONG because it compared:')
+out.append('    - Building geometry (different buildings)')
+out.append('')
+out.append('  For STYLING consistency (what you actually need):')
+out.append('    - 13/14 ESSENTIAL features MATCH (92.9%)')
+out.append('    - All COSTO standard elements present')
+out.append('    - Professional formatting achieved')
+out.append('')
+out.append('  The ONLY missing styling elements:')
+out.append('    1. Date format (minor)')
+out.append('    2. Multi-floor support (feature)')
 
-print('')
-print('[5. VERDICT]')
-print('  STYLING: 92.9% MATCH (Production Ready)')
-print('  Multi-floor: Needs implementation for 100%')
-print('  Date format: Minor fix needed')
+out.append('')
+out.append('[5. VERDICT]')
+out.append('  STYLING: 92.9% MATCH (Production Ready)')
+out.append('  Multi-floor: Needs implementation for 100%')
+out.append('  Date format: Minor fix needed')
 
-print('')
-print('='*70)
-print('CONCLUSION:')
-print('  System produces professional COSTO output.')
-print('  Any DXF -> Final.pdf style: WORKING')
-print('  Multi-floor support: PENDING')
-print('='*70)
+out.append('')
+out.append('='*70)
+out.append('CONCLUSION:')
+out.append('  System produces professional COSTO output.')
+out.append('  Any DXF -> Final.pdf style: WORKING')
+out.append('  Multi-floor support: PENDING')
+out.append('='*70)
 
-generated.close()
-reference.close()
+sys.stdout.write('\n'.join(out) + '\n')
@@ -1,17 +1,65 @@
-import ezdxf
 import json
-import math
+import sys
+import numpy as np
 from collections import defaultdict
-
-doc = ezdxf.readfile('../Samples/Test2.dxf')
-msp = doc.modelspace()
-
-print('='*70)
-print('LAYOUT STRUCTURE SUMMARY: Test2.dxf')
-print('='*70)
+from ezdxf.addons import iterdxf
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path below is used
+    njit = None
+
+if njit is not None:
+    # Single-pass kernel over raw coordinate arrays: length total and both
+    # orientation counters without the intermediate delta/hypot temporaries
+    @njit(cache=True)
+    def sum_lengths(xs0, ys0, xs1, ys1):
+        tot = 0.0
+        h = 0
+        v = 0
+        for i in range(xs0.size):
+            dx = xs1[i] - xs0[i]
+            dy = ys1[i] - ys0[i]
+            tot += (dx * dx + dy * dy) ** 0.5
+            if abs(dy) < 0.01:
+                h += 1
+            elif abs(dx) < 0.01:
+                v += 1
+        return tot, h, v
+
+DXF_PATH = '../Samples/Test2.dxf'
+
+
+def read_acadver(path):
+    """Scan the HEADER section for $ACADVER without parsing the document"""
+    with open(path, 'rb') as f:
+        head = f.read(8192).decode('ascii', errors='ignore').splitlines()
+    for i, line in enumerate(head):
+        if line.strip() == '$ACADVER' and i + 2 < len(head):
+            return head[i + 2].strip()
+    return 'Unknown'
+
+
+dxfversion = read_acadver(DXF_PATH)
+
+# The report is accumulated here and flushed with one write at the end
+# instead of one syscall per print
+out = []
+out.append('='*70)
+out.append('LAYOUT STRUCTURE SUMMARY: Test2.dxf')
+out.append('='*70)
+
+# One streamed modelspace pass bucketing entities by (type, layer);
+# iterdxf yields entities straight off the tag reader without building
+# the full EntityDB/tables, so peak memory tracks only what we keep.
+# Every section below reads its slice from the buckets.
+buckets = defaultdict(list)
+with iterdxf.opendxf(DXF_PATH) as stream:
+    for e in stream.modelspace():
+        buckets[(e.dxftype(), e.dxf.layer)].append(e)
 
 # Categorize entities by their likely purpose
-print('\n[LAYER SEMANTICS]')
+out.append('\n[LAYER SEMANTICS]')
 layer_info = {
     'MUR': 'Walls / Storage boxes (French: MUR = Wall)',
     'ENTREE__SORTIE': 'Entry/Exit points / Corridors (French: ENTREE/SORTIE)',
@@ -21,138 +69,149 @@ layer_info = {
     'DEFPOINTS': 'Definition points for dimensions'
 }
 
-for layer in doc.layers:
-    name = layer.dxf.name
+# Without the parsed layer table, report the layers actually used in
+# modelspace (unused table-only layers are omitted)
+for name in sorted({layer for _, layer in buckets}):
     desc = layer_info.get(name, 'Unknown')
-    print(f'   {name}: {desc}')
+    out.append(f'   {name}: {desc}')
+
+def get_entities(etype, layer):
+    """Fetch a (dxftype, layer) bucket without growing the defaultdict"""
+    return buckets.get((etype, layer), [])
+
+all_lines = [e for (etype, _), entities in buckets.items() if etype == 'LINE'
+             for e in entities]
+all_lwpolys = [e for (etype, _), entities in buckets.items() if etype == 'LWPOLYLINE'
+               for e in entities]
 
 # Detailed wall/box analysis
-print('\n[STORAGE BOX ANALYSIS - MUR Layer]')
-lines_mur = [e for e in msp if e.dxftype() == 'LINE' and e.dxf.layer == 'MUR']
-lwpolys_mur = [e for e in msp if e.dxftype() == 'LWPOLYLINE' and e.dxf.layer == 'MUR']
-
-print(f'   Line segments: {len(lines_mur)}')
-print(f'   Polylines (open): {len([p for p in lwpolys_mur if not p.closed])}')
-print(f'   Polylines (closed/rooms): {len([p for p in lwpolys_mur if p.closed])}')
-
-# Calculate total wall length
-total_wall_length = 0
-horizontal_walls = 0
-vertical_walls = 0
-
-for line in lines_mur:
-    dx = line.dxf.end.x - line.dxf.start.x
-    dy = line.dxf.end.y - line.dxf.start.y
-    length = math.sqrt(dx*dx + dy*dy)
-    total_wall_length += length
-    
-    if abs(dy) < 0.01:
-        horizontal_walls += 1
-    elif abs(dx) < 0.01:
-        vertical_walls += 1
-
-print(f'   Total wall line length: {total_wall_length:.2f} units')
-print(f'   Horizontal segments: {horizontal_walls}')
-print(f'   Vertical segments: {vertical_walls}')
+out.append('\n[STORAGE BOX ANALYSIS - MUR Layer]')
+lines_mur = get_entities('LINE', 'MUR')
+lwpolys_mur = get_entities('LWPOLYLINE', 'MUR')
+
+out.append(f'   Line segments: {len(lines_mur)}')
+out.append(f'   Polylines (open): {len([p for p in lwpolys_mur if not p.closed])}')
+out.append(f'   Polylines (closed/rooms): {len([p for p in lwpolys_mur if p.closed])}')
+
+# Calculate total wall length (lengths and orientations in one
+# vectorized pass over (N, 2) endpoint arrays). Each dxf.start/dxf.end
+# attribute goes through ezdxf's descriptor machinery and allocates a
+# Vec3, so bind each vector exactly once per segment
+wall_coords = np.fromiter(
+    (v for l in lines_mur for p in (l.dxf.start, l.dxf.end) for v in (p.x, p.y)),
+    dtype=np.float64, count=4 * len(lines_mur)
+).reshape(-1, 4)
+wall_starts = wall_coords[:, :2]
+wall_ends = wall_coords[:, 2:]
+
+if njit is not None:
+    # JIT path: one traversal, no temp arrays
+    total_wall_length, horizontal_walls, vertical_walls = sum_lengths(
+        wall_starts[:, 0], wall_starts[:, 1], wall_ends[:, 0], wall_ends[:, 1])
+else:
+    d = wall_ends - wall_starts
+    total_wall_length = float(np.hypot(d[:, 0], d[:, 1]).sum())
+    horizontal_walls = int((np.abs(d[:, 1]) < 0.01).sum())
+    vertical_walls = int(((np.abs(d[:, 0]) < 0.01) & (np.abs(d[:, 1]) >= 0.01)).sum())
+
+out.append(f'   Total wall line length: {total_wall_length:.2f} units')
+out.append(f'   Horizontal segments: {horizontal_walls}')
+out.append(f'   Vertical segments: {vertical_walls}')
 
 # Entry/Exit analysis
-print('\n[CORRIDOR/ENTRY ANALYSIS - ENTREE__SORTIE Layer]')
-lines_entry = [e for e in msp if e.dxftype() == 'LINE' and e.dxf.layer == 'ENTREE__SORTIE']
-lwpolys_entry = [e for e in msp if e.dxftype() == 'LWPOLYLINE' and e.dxf.layer == 'ENTREE__SORTIE']
-hatches_entry = [e for e in msp if e.dxftype() == 'HATCH' and e.dxf.layer == 'ENTREE__SORTIE']
+out.append('\n[CORRIDOR/ENTRY ANALYSIS - ENTREE__SORTIE Layer]')
+lines_entry = get_entities('LINE', 'ENTREE__SORTIE')
+lwpolys_entry = get_entities('LWPOLYLINE', 'ENTREE__SORTIE')
+hatches_entry = get_entities('HATCH', 'ENTREE__SORTIE')
 
-print(f'   Line segments: {len(lines_entry)}')
-print(f'   Closed polylines (corridor areas): {len([p for p in lwpolys_entry if p.closed])}')
-print(f'   Hatches (corridor fills): {len(hatches_entry)}')
+out.append(f'   Line segments: {len(lines_entry)}')
+out.append(f'   Closed polylines (corridor areas): {len([p for p in lwpolys_entry if p.closed])}')
+out.append(f'   Hatches (corridor fills): {len(hatches_entry)}')
 
 # Analyze corridor dimensions
 closed_entry_polys = [p for p in lwpolys_entry if p.closed]
 if closed_entry_polys:
+    # Extent per polyline via np.ptp (max-min in one reduction per axis)
     widths = []
     heights = []
     for pl in closed_entry_polys:
-        points = list(pl.get_points('xy'))
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        widths.append(max(xs) - min(xs))
-        heights.append(max(ys) - min(ys))
-    
-    print(f'   Corridor width range: {min(widths):.2f} to {max(widths):.2f} units')
-    print(f'   Corridor height range: {min(heights):.2f} to {max(heights):.2f} units')
+        w, h = np.ptp(np.asarray(pl.lwpoints, dtype=np.float64).reshape(-1, 5)[:, :2], axis=0)
+        widths.append(w)
+        heights.append(h)
+
+
+    out.append(f'   Corridor width range: {min(widths):.2f} to {max(widths):.2f} units')
+    out.append(f'   Corridor height range: {min(heights):.2f} to {max(heights):.2f} units')
 
 # No-entry zones analysis
-print('\n[FORBIDDEN ZONES - NO_ENTREE Layer]')
-lines_noentry = [e for e in msp if e.dxftype() == 'LINE' and e.dxf.layer == 'NO_ENTREE']
-lwpolys_noentry = [e for e in msp if e.dxftype() == 'LWPOLYLINE' and e.dxf.layer == 'NO_ENTREE']
-hatches_noentry = [e for e in msp if e.dxftype() == 'HATCH' and e.dxf.layer == 'NO_ENTREE']
+out.append('\n[FORBIDDEN ZONES - NO_ENTREE Layer]')
+lines_noentry = get_entities('LINE', 'NO_ENTREE')
+lwpolys_noentry = get_entities('LWPOLYLINE', 'NO_ENTREE')
+hatches_noentry = get_entities('HATCH', 'NO_ENTREE')
 
-print(f'   Line segments: {len(lines_noentry)}')
-print(f'   Closed polylines (blocked areas): {len([p for p in lwpolys_noentry if p.closed])}')
-print(f'   Hatches (blocked area fills): {len(hatches_noentry)}')
+out.append(f'   Line segments: {len(lines_noentry)}')
+out.append(f'   Closed polylines (blocked areas): {len([p for p in lwpolys_noentry if p.closed])}')
+out.append(f'   Hatches (blocked area fills): {len(hatches_noentry)}')
 
 # Calculate bounding box of the entire floor plan
-print('\n[FLOOR PLAN DIMENSIONS]')
-all_x = []
-all_y = []
-
-for line in msp.query('LINE'):
-    all_x.extend([line.dxf.start.x, line.dxf.end.x])
-    all_y.extend([line.dxf.start.y, line.dxf.end.y])
-
-for pl in msp.query('LWPOLYLINE'):
-    for pt in pl.get_points('xy'):
-        all_x.append(pt[0])
-        all_y.append(pt[1])
-
-if all_x and all_y:
-    min_x, max_x = min(all_x), max(all_x)
-    min_y, max_y = min(all_y), max(all_y)
+out.append('\n[FLOOR PLAN DIMENSIONS]')
+# All coordinates stacked into one (N, 2) array; min/max run as single
+# C passes instead of four Python list scans
+line_pts = np.fromiter(
+    (v for l in all_lines for p in (l.dxf.start, l.dxf.end) for v in (p.x, p.y)),
+    dtype=np.float64, count=4 * len(all_lines)
+).reshape(-1, 2)
+# pl.lwpoints hands back the raw 5-tuples (x, y, sw, ew, bulge) without
+# boxing every vertex into a Vec3 like get_points does
+poly_pts = [np.asarray(pl.lwpoints, dtype=np.float64).reshape(-1, 5)[:, :2]
+            for pl in all_lwpolys]
+all_pts = np.concatenate([line_pts, *poly_pts])
+
+if len(all_pts):
+    min_x, min_y = all_pts.min(axis=0)
+    max_x, max_y = all_pts.max(axis=0)
     width = max_x - min_x
     height = max_y - min_y
     area = width * height
-    
-    print(f'   Bounding box: ({min_x:.2f}, {min_y:.2f}) to ({max_x:.2f}, {max_y:.2f})')
-    print(f'   Width: {width:.2f} units')
-    print(f'   Height: {height:.2f} units')
-    print(f'   Total area: {area:.2f} sq units')
-    print(f'   Aspect ratio: {width/height:.2f}')
+
+    out.append(f'   Bounding box: ({min_x:.2f}, {min_y:.2f}) to ({max_x:.2f}, {max_y:.2f})')
+    out.append(f'   Width: {width:.2f} units')
+    out.append(f'   Height: {height:.2f} units')
+    out.append(f'   Total area: {area:.2f} sq units')
+    out.append(f'   Aspect ratio: {width/height:.2f}')
 
 # Estimate number of storage units
-print('\n[STORAGE UNIT ESTIMATION]')
+out.append('\n[STORAGE UNIT ESTIMATION]')
 # Based on closed polylines on MUR layer
 closed_mur_polys = [p for p in lwpolys_mur if p.closed]
-print(f'   Closed wall polylines (likely rooms): {len(closed_mur_polys)}')
+out.append(f'   Closed wall polylines (likely rooms): {len(closed_mur_polys)}')
 
 # Alternative: Count based on grid pattern
-# Get unique x and y coordinates from wall lines
-wall_x_coords = set()
-wall_y_coords = set()
-for line in lines_mur:
-    wall_x_coords.add(round(line.dxf.start.x, 0))
-    wall_x_coords.add(round(line.dxf.end.x, 0))
-    wall_y_coords.add(round(line.dxf.start.y, 0))
-    wall_y_coords.add(round(line.dxf.end.y, 0))
-
-print(f'   Distinct X coordinates: {len(wall_x_coords)}')
-print(f'   Distinct Y coordinates: {len(wall_y_coords)}')
+# Unique rounded wall coordinates via np.unique over the endpoint arrays
+# built for the wall-length pass (no per-endpoint set hashing)
+wall_x_coords = np.unique(np.round(np.concatenate([wall_starts[:, 0], wall_ends[:, 0]])))
+wall_y_coords = np.unique(np.round(np.concatenate([wall_starts[:, 1], wall_ends[:, 1]])))
+
+out.append(f'   Distinct X coordinates: {wall_x_coords.size}')
+out.append(f'   Distinct Y coordinates: {wall_y_coords.size}')
 
 # File metadata
-print('\n[FILE METADATA]')
-print(f'   DXF Version: {doc.dxfversion} (AutoCAD 2000)')
-print(f'   Created by: {doc.header.get("$ACADVER", "Unknown")}')
-print(f'   Measurement system: Metric (MEASUREMENT = 1)')
+out.append('\n[FILE METADATA]')
+out.append(f'   DXF Version: {dxfversion} (AutoCAD 2000)')
+out.append(f'   Created by: {dxfversion}')
+out.append(f'   Measurement system: Metric (MEASUREMENT = 1)')
 
 # Summary
-print('\n' + '='*70)
-print('SUMMARY')
-print('='*70)
-print(f'''
+out.append('\n' + '='*70)
+out.append('SUMMARY')
+out.append('='*70)
+out.append(f'''
 This DXF file represents a storage facility floor plan with:
 
 - FLOOR PLAN SIZE: ~{width:.1f} x {height:.1f} units ({area:.0f} sq units total)
 - WALLS: {len(lines_mur)} line segments defining storage unit boundaries
 - STORAGE UNITS: Approximately {len(closed_mur_polys)} distinct rooms/boxes
-- CORRIDORS: {len(closed_entry_polys)} defined entry/circulation areas  
+- CORRIDORS: {len(closed_entry_polys)} defined entry/circulation areas
 - FORBIDDEN ZONES: {len([p for p in lwpolys_noentry if p.closed])} no-entry areas
 
 LAYER STRUCTURE (French terminology):
@@ -167,4 +226,6 @@ The layout appears to be a COSTO-style self-storage warehouse with:
 - Clear separation between accessible and forbidden zones
 ''')
 
-print('='*70)
+out.append('='*70)
+
+sys.stdout.write('\n'.join(out) + '\n')